@@ -0,0 +1,102 @@
+import os
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+from dotenv import load_dotenv
+
+"""
+Add the patients.external_id column (Endotools internal patient id), if missing (the app also adds it at startup),
+and fill it for existing rows by looking up each patient's demographics by MRN in Endotools.
+
+Usage:
+    Use default .env.local
+    > python scripts/backfill_patient_external_id.py
+
+    Use a specific config file, only show what would be updated
+    > python scripts/backfill_patient_external_id.py -c .env.prod --dry-run
+
+    Show help
+    > python scripts/backfill_patient_external_id.py --help
+"""
+
+BASE_DIR = Path(__file__).parent.parent
+CONF_DIR = Path(BASE_DIR) / 'conf'
+
+os.chdir(BASE_DIR)
+sys.path.insert(0, str(BASE_DIR))
+
+# Parse command-line arguments
+parser = argparse.ArgumentParser(description='Backfill the Endotools patient id of existing patients')
+parser.add_argument(
+    '--config',
+    '-c',
+    type=str,
+    default='.env.local',
+    help='Configuration file name (default: .env.local)'
+)
+parser.add_argument('--dry-run', action='store_true', help='Look up the ids but do not update the database')
+args = parser.parse_args()
+
+# Load environment variables from the specified config file
+env_path = Path(CONF_DIR) / args.config
+if not env_path.exists():
+    print(f"❌ Error: Configuration file '{env_path}' not found!")
+    sys.exit(1)
+
+print(f"📄 Loading configuration from: {args.config}")
+load_dotenv(env_path)
+
+
+from sqlalchemy import inspect, select, update
+
+from src.core.database import engine, SessionLocal
+from src.core.schema import add_missing_columns
+from src.infrastructure.external.endotools.exceptions import ExternalAPIError
+from src.models import Patient
+from src.services.common.deps import create_endotools_client
+
+
+def has_external_id_column() -> bool:
+    columns = {column["name"] for column in inspect(engine).get_columns(Patient.__tablename__)}
+    return "external_id" in columns
+
+
+async def lookup_external_ids(mrns: list[str]) -> dict[str, int]:
+    external_ids = {}
+    async with create_endotools_client() as client:
+        for mrn in mrns:
+            try:
+                external_ids[mrn] = (await client.get_demographics(mrn)).id
+            except ExternalAPIError as e:
+                print(f"⚠️  MRN {mrn}: not resolved ({e})")
+    return external_ids
+
+
+column_exists = has_external_id_column()
+if not column_exists and not args.dry_run:
+    print("🔹 Adding column patients.external_id...")
+    with engine.begin() as connection:
+        add_missing_columns(connection)
+    column_exists = True
+
+with SessionLocal() as db:
+    stmt = select(Patient.id, Patient.mrn).where(Patient.mrn_system == "endotools")
+    if column_exists:
+        stmt = stmt.where(Patient.external_id.is_(None))
+    patients = db.execute(stmt).all()
+    print(f"🔹 {len(patients)} patients without Endotools id")
+
+    external_ids = asyncio.run(lookup_external_ids([patient.mrn for patient in patients]))
+    for patient in patients:
+        if patient.mrn in external_ids:
+            print(f"   {patient.mrn} → {external_ids[patient.mrn]}")
+            if not args.dry_run:
+                db.execute(update(Patient).where(Patient.id == patient.id)
+                           .values(external_id=external_ids[patient.mrn]))
+
+    if args.dry_run:
+        print("✅ Dry run, nothing updated")
+    else:
+        db.commit()
+        print(f"✅ {len(external_ids)} of {len(patients)} patients updated")
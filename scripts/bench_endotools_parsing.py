@@ -0,0 +1,182 @@
+import os
+import sys
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, time as dt_time
+from pathlib import Path
+from dotenv import load_dotenv
+
+"""
+Benchmark parsing of Endotools list responses (examinations and appointments)
+
+Compares the legacy path (response.json() + per-row model_validate with a Python "before" validator) with the
+bulk path used by the client (TypeAdapter(list[DTO]).validate_json on the raw bytes, declarative parsing).
+
+Usage:
+    Use default .env.local and 100000 synthetic rows
+    > python scripts/bench_endotools_parsing.py
+
+    Use a specific config file and number of rows
+    > python scripts/bench_endotools_parsing.py -c .env.dev --rows 20000
+
+    Show help
+    > python scripts/bench_endotools_parsing.py --help
+"""
+
+BASE_DIR = Path(__file__).parent.parent
+CONF_DIR = Path(BASE_DIR) / 'conf'
+
+os.chdir(BASE_DIR)
+sys.path.insert(0, str(BASE_DIR))
+
+# Parse command-line arguments
+parser = argparse.ArgumentParser(description='Benchmark parsing of Endotools list responses')
+parser.add_argument(
+    '--config',
+    '-c',
+    type=str,
+    default='.env.local',
+    help='Configuration file name (default: .env.local)'
+)
+parser.add_argument('--rows', '-n', type=int, default=100_000, help='Rows per synthetic list (default: 100000)')
+parser.add_argument('--repeat', '-r', type=int, default=3, help='Runs per parser, best one is kept (default: 3)')
+args = parser.parse_args()
+
+# Load environment variables from the specified config file
+env_path = Path(CONF_DIR) / args.config
+if not env_path.exists():
+    print(f"❌ Error: Configuration file '{env_path}' not found!")
+    sys.exit(1)
+load_dotenv(env_path)
+
+
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from src.infrastructure.external.endotools.schemas import AppointmentListAdapter, ExaminationListAdapter
+
+
+# --- Legacy parsing (per-row model_validate with a "before" validator), kept here for comparison ---
+
+def _legacy_date(value):
+    if value in (None, ""):
+        return None
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _legacy_time(value):
+    if value in (None, ""):
+        return None
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _legacy_nombre(value):
+    return value.get("nombre") if isinstance(value, dict) else None
+
+
+class LegacyAppointmentDTO(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: int
+    fecha: date | None = None
+    hora: dt_time | None = None
+    exploracion_id: int | None = None
+    tipo_exploracion: str | None = None
+
+    @model_validator(mode="before")
+    def preprocess_fields(cls, values: dict) -> dict:
+        values["tipo_exploracion"] = _legacy_nombre(values.get("tipoExploracion"))
+        values["fecha"] = _legacy_date(values.get("fecha"))
+        values["hora"] = _legacy_time(values.get("hora"))
+        return values
+
+
+class LegacyExaminationDTO(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: int
+    fecha: date | None = None
+    servicio: str | None = None
+    tipo: str | None = None
+    medico: str | None = None
+
+    @model_validator(mode="before")
+    def preprocess_fields(cls, values: dict) -> dict:
+        values["fecha"] = _legacy_date(values.get("fecha"))
+        values["servicio"] = _legacy_nombre(values.get("servicio"))
+        values["tipo"] = _legacy_nombre(values.get("tipoExploracion"))
+        values["medico"] = _legacy_nombre(values.get("medico"))
+        return values
+
+
+def legacy_parse(dto: type[BaseModel], content: bytes) -> list:
+    return [dto.model_validate(row) for row in json.loads(content)]
+
+
+# --- Synthetic responses ---
+
+def _random_date() -> str:
+    d = date(2015, 1, 1).toordinal() + random.randrange(4000)
+    d = date.fromordinal(d)
+    # Mostly ISO, some DD/MM/YYYY and some empty values, as Endotools sends them
+    return random.choices([d.isoformat(), d.strftime("%d/%m/%Y"), ""], weights=[90, 8, 2])[0]
+
+
+def appointments(rows: int) -> bytes:
+    return json.dumps([{
+        "id": i,
+        "fecha": _random_date(),
+        "hora": f"{random.randrange(8, 20):02d}:{random.choice(['00', '15', '30', '45'])}:00",
+        "exploracion_id": random.randrange(1, 10**6),
+        "tipoExploracion": {"id": 3, "nombre": "Colonoscopia", "codigo": "COL"},
+        "paciente_id": 123,
+        "observaciones": "",
+    } for i in range(rows)]).encode()
+
+
+def examinations(rows: int) -> bytes:
+    return json.dumps([{
+        "id": i,
+        "fecha": _random_date(),
+        "estado": 1,
+        "servicio": {"id": 1, "nombre": "Digestivo"},
+        "tipoExploracion": {"id": 3, "nombre": "Gastroscopia", "codigo": "GAS"},
+        "medico": {"id": 7, "nombre": "Dra. García", "colegiado": "28/123456"},
+        "paciente_id": 123,
+    } for i in range(rows)]).encode()
+
+
+def bench(name: str, parse, content: bytes, rows: int) -> float:
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        parse(content)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<40} {best * 1000:9.1f} ms  {rows / best:>12,.0f} rows/s")
+    return best
+
+
+random.seed(0)
+for label, content, legacy_dto, adapter in [
+    ("Examinations", examinations(args.rows), LegacyExaminationDTO, ExaminationListAdapter),
+    ("Appointments", appointments(args.rows), LegacyAppointmentDTO, AppointmentListAdapter),
+]:
+    # Both parsers must agree before timing them
+    assert [m.model_dump() for m in legacy_parse(legacy_dto, content)] == \
+           [m.model_dump() for m in adapter.validate_json(content)]
+
+    print(f"{label}: {args.rows} rows, {len(content) / 1024 / 1024:.1f} MiB")
+    before = bench("json() + model_validate per row", lambda c: legacy_parse(legacy_dto, c), content, args.rows)
+    after = bench("TypeAdapter.validate_json", adapter.validate_json, content, args.rows)
+    print(f"  speed-up: x{before / after:.1f}")
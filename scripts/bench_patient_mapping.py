@@ -0,0 +1,151 @@
+import os
+import sys
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import date, time as dt_time
+from pathlib import Path
+from dotenv import load_dotenv
+
+"""
+Benchmark mapping of Endotools DTOs to view models (appointments, examinations, reports)
+
+Compares the previous view models (pydantic models, validated again on construction; kept inline below) with the
+current ones (slotted dataclasses in src/schemas/patient.py, no revalidation), through the mappers in
+src/mappers/endotools. Reports the cost per row and the memory retained per mapped row.
+
+Usage:
+    Use default .env.local and a 10000-row history
+    > python scripts/bench_patient_mapping.py
+
+    Use a specific config file and number of rows
+    > python scripts/bench_patient_mapping.py -c .env.dev --rows 50000
+
+    Show help
+    > python scripts/bench_patient_mapping.py --help
+"""
+
+BASE_DIR = Path(__file__).parent.parent
+CONF_DIR = Path(BASE_DIR) / 'conf'
+
+os.chdir(BASE_DIR)
+sys.path.insert(0, str(BASE_DIR))
+
+# Parse command-line arguments
+parser = argparse.ArgumentParser(description='Benchmark mapping of Endotools DTOs to view models')
+parser.add_argument(
+    '--config',
+    '-c',
+    type=str,
+    default='.env.local',
+    help='Configuration file name (default: .env.local)'
+)
+parser.add_argument('--rows', '-n', type=int, default=10_000, help='Rows per history (default: 10000)')
+parser.add_argument('--repeat', '-r', type=int, default=5, help='Runs per mapper, best one is kept (default: 5)')
+args = parser.parse_args()
+
+# Load environment variables from the specified config file
+env_path = Path(CONF_DIR) / args.config
+if not env_path.exists():
+    print(f"❌ Error: Configuration file '{env_path}' not found!")
+    sys.exit(1)
+load_dotenv(env_path)
+
+
+from pydantic import BaseModel
+
+from src.infrastructure.external.endotools.schemas import AppointmentDTO, ExaminationDTO, ReportDTO
+from src.mappers.endotools.data_mapper import to_appointment, to_examination, to_report
+
+
+# --- Previous view models (pydantic, validated on construction), kept here for comparison ---
+
+class ValidatedAppointment(BaseModel):
+    appointment_id: int
+    date: date
+    time: dt_time
+    procedure: str | None
+
+
+class ValidatedExamination(BaseModel):
+    exam_id: int
+    date: date
+    service: str | None
+    procedure: str | None
+    physician: str | None
+    is_report_available: bool | None = False
+
+
+class ValidatedReport(BaseModel):
+    report_id: str
+    date: date
+    procedure: str | None
+
+
+def validated_appointment(dto: AppointmentDTO) -> ValidatedAppointment:
+    return ValidatedAppointment(appointment_id=dto.id, date=dto.fecha, time=dto.hora, procedure=dto.tipo_exploracion)
+
+
+def validated_examination(dto: ExaminationDTO) -> ValidatedExamination:
+    return ValidatedExamination(exam_id=dto.id, date=dto.fecha, service=dto.servicio, procedure=dto.tipo,
+                                physician=dto.medico)
+
+
+def validated_report(dto: ReportDTO) -> ValidatedReport:
+    return ValidatedReport(report_id=dto.id, date=dto.fecha, procedure=dto.tipo)
+
+
+# --- Synthetic, already validated DTOs ---
+
+def _random_date() -> date:
+    return date.fromordinal(date(2015, 1, 1).toordinal() + random.randrange(4000))
+
+
+def histories(rows: int) -> dict[str, list]:
+    return {
+        "Appointments": [AppointmentDTO.model_construct(
+            id=i, fecha=_random_date(), hora=dt_time(random.randrange(8, 20), 30), exploracion_id=i,
+            tipo_exploracion="Colonoscopia") for i in range(rows)],
+        "Examinations": [ExaminationDTO.model_construct(
+            id=i, fecha=_random_date(), servicio="Digestivo", tipo="Gastroscopia", medico="Dra. García")
+            for i in range(rows)],
+        "Reports": [ReportDTO.model_construct(id=str(i), fecha=_random_date(), tipo="Gastroscopia")
+                    for i in range(rows)],
+    }
+
+
+def bench(name: str, mapper, dtos: list) -> None:
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        [mapper(dto) for dto in dtos]
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    mapped = [mapper(dto) for dto in dtos]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del mapped
+
+    rows = len(dtos)
+    print(f"  {name:<24} {best / rows * 1e6:7.2f} µs/row  {retained / rows:7.0f} B/row retained  "
+          f"{peak / rows:7.0f} B/row peak")
+
+
+random.seed(0)
+for label, dtos in histories(args.rows).items():
+    mapper, validated_mapper = {
+        "Appointments": (to_appointment, validated_appointment),
+        "Examinations": (to_examination, validated_examination),
+        "Reports": (to_report, validated_report),
+    }[label]
+    # Both mappers must agree before measuring them
+    assert [asdict(m) for m in map(mapper, dtos)] == [m.model_dump() for m in map(validated_mapper, dtos)]
+
+    print(f"{label}: {args.rows} rows")
+    bench("pydantic, validated", validated_mapper, dtos)
+    bench("slotted dataclass", mapper, dtos)
@@ -0,0 +1,66 @@
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+"""
+Build the static assets: gzip / brotli variants of the text files and the fingerprints manifest, in STATIC_BUILD_DIR.
+Only files changed since the previous build are compressed again. Run it at deploy time together with
+STATIC_BUILD_ON_STARTUP=False, so the app only loads the manifest when starting.
+
+Usage:
+    Use default .env.local
+    > python scripts/build_static.py
+
+    Use a specific config file
+    > python scripts/build_static.py -c .env.prod
+
+    Show help
+    > python scripts/build_static.py --help
+"""
+
+BASE_DIR = Path(__file__).parent.parent
+CONF_DIR = Path(BASE_DIR) / 'conf'
+
+os.chdir(BASE_DIR)
+sys.path.insert(0, str(BASE_DIR))
+
+# Parse command-line arguments
+parser = argparse.ArgumentParser(description='Build precompressed and fingerprinted static assets')
+parser.add_argument(
+    '--config',
+    '-c',
+    type=str,
+    default='.env.local',
+    help='Configuration file name (default: .env.local)'
+)
+args = parser.parse_args()
+
+# Load environment variables from the specified config file
+env_path = Path(CONF_DIR) / args.config
+if not env_path.exists():
+    print(f"❌ Error: Configuration file '{env_path}' not found!")
+    sys.exit(1)
+
+print(f"📄 Loading configuration from: {args.config}")
+load_dotenv(env_path)
+
+
+from src.core.static import static_files
+from src.lib.static.assets import variant_path
+
+
+start = time.perf_counter()
+static_files.build()
+manifest = static_files.manifest
+original = compressed = 0
+for path, entry in manifest.files.items():
+    if entry["encodings"]:  # best variant first
+        original += entry["size"]
+        compressed += os.path.getsize(variant_path(static_files.build_dir, path, entry["encodings"][0]))
+
+print(f"✅ {len(manifest.files)} files in {static_files.build_dir} ({time.perf_counter() - start:.1f} s)")
+if original:
+    print(f"   compressible files: {original / 1024:.0f} KiB → {compressed / 1024:.0f} KiB")
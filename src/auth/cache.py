@@ -0,0 +1,46 @@
+import sys
+from dataclasses import dataclass
+
+from src.core.config import settings
+from src.lib.cache import LRUCache, MISSING
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """ Compact, immutable view of an authenticated user: what the pages need, detached from any DB session """
+    id: int
+    is_active: bool
+    name: str
+    mrn: str | None  # None if the user has no linked patient
+    patient_external_id: int | None = None  # Endotools patient id, if stored
+
+
+class UserSnapshotCache:
+    """
+    Short-TTL, in-process cache of UserSnapshot keyed by user id, so most authenticated requests make no DB
+    round-trip. Call `invalidate` whenever the app changes a user's credentials. Being per process, other workers
+    only see the change once their entry expires, hence the short TTL. Users are deactivated outside the app
+    (admin / database), so a deactivated user stays authenticated for up to the TTL.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self._lru = LRUCache(max_bytes=sys.maxsize, max_entries=max_entries)
+
+    @property
+    def lru(self) -> LRUCache:
+        return self._lru
+
+    def get(self, user_id: int) -> UserSnapshot | None:
+        snapshot = self._lru.get(user_id)
+        return None if snapshot is MISSING else snapshot
+
+    def set(self, snapshot: UserSnapshot) -> None:
+        self._lru.set(snapshot.id, snapshot, ttl=self.ttl)
+
+    def invalidate(self, user_id: int) -> None:
+        self._lru.delete(user_id)
+
+
+user_cache = UserSnapshotCache(ttl=settings.USER_CACHE_TTL, max_entries=settings.USER_CACHE_MAX_ENTRIES)
+"""Global authenticated-user cache"""
@@ -3,19 +3,20 @@ from typing import Annotated, TypeAlias
 from fastapi import Request, Depends, HTTPException, status, Form
 from itsdangerous import BadSignature
 
+from src.auth.cache import UserSnapshot, user_cache
 from src.auth.secret import serializer
 from src.auth.session import SESSION_COOKIE_NAME, SESSION_MAX_AGE, SESSION_USER_KEY, get_csrf_token
 from src.core.database import DBSessionDep
 
-from src.models import User
 from src.services import user as user_service
 
 
 # Retrieve current user from cookie
-def get_current_user(request: Request, db: DBSessionDep) -> User | None:
+async def get_current_user(request: Request, db: DBSessionDep) -> UserSnapshot | None:
     """
-    Return user from session cookie, if valid and active.
+    Return a snapshot of the user from session cookie, if valid and active.
     If cookie is invalid, return None.
+    Snapshots are cached for a short while (see src.auth.cache), so most requests skip the DB lookup.
     Below an annotated dependency is defined, for convenience.
     """
     session_cookie = request.cookies.get(SESSION_COOKIE_NAME)
@@ -24,15 +25,22 @@ def get_current_user(request: Request, db: DBSessionDep) -> User | None:
     try:
         data = serializer.loads(session_cookie, max_age=SESSION_MAX_AGE)
         user_id = data.get(SESSION_USER_KEY)
-        return user_service.get_active_user_by_id(db, user_id)
     except BadSignature:
         return None
 
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        snapshot = await user_service.get_active_user_snapshot(db, user_id)
+        if snapshot is None:
+            return None
+        user_cache.set(snapshot)
+    return snapshot
 
-CurrentUserDep: TypeAlias = Annotated[User | None, Depends(get_current_user)]
 
+CurrentUserDep: TypeAlias = Annotated[UserSnapshot | None, Depends(get_current_user)]
 
-def get_login_required_user(user: CurrentUserDep) -> User:
+
+def get_login_required_user(user: CurrentUserDep) -> UserSnapshot:
     """
     Check if the user is logged in, raising an exception if not.
     Depends on the function that returns the user from the session cookie, if valid.
@@ -43,7 +51,7 @@ def get_login_required_user(user: CurrentUserDep) -> User:
     return user
 
 
-LoginRequiredDep: TypeAlias = Annotated[User, Depends(get_login_required_user)]
+LoginRequiredDep: TypeAlias = Annotated[UserSnapshot, Depends(get_login_required_user)]
 
 
 def csrf_protect(request: Request, csrf_token: str = Form(..., alias="_csrf")) -> None:
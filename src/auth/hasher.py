@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from src.auth import pwd
+from src.core.config import settings, logger
+from src.core.metrics import PASSWORD_HASH_SECONDS
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hasher queue is full and the call is rejected without waiting"""
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt (CPU bound, ~250 ms per call) on a dedicated, size-limited thread pool, so it never blocks the
+    event loop nor takes the threadpool slots shared with the rest of the app. bcrypt releases the GIL while
+    hashing, so threads give real parallelism up to `max_workers`.
+
+    At most `max_workers` calls run at once and up to `max_queue` more wait for a worker; beyond that, calls fail
+    fast with PasswordHasherBusyError instead of piling up (e.g. during a login burst).
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 16):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.pending = 0  # submitted and not finished yet (queued + running)
+        self.active = 0  # running on a worker
+        self.completed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """ Calls waiting for a worker """
+        return self.pending - self.active
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queue_depth": self.queue_depth,
+            "active": self.active,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(pwd.hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd.verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                logger.warning(f"Password hasher saturated ({self.pending} calls pending), rejecting call")
+                raise PasswordHasherBusyError("Password hasher is busy")
+            self.pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.pending - self.max_workers)
+
+        loop = asyncio.get_running_loop()
+        # The slot is released when the worker finishes, even if the awaiting request was cancelled meanwhile
+        return await loop.run_in_executor(self._executor, self._call, fn, *args)
+
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            self.active += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_SECONDS.labels(fn.__name__).observe(time.perf_counter() - start)
+            with self._lock:
+                self.active -= 1
+                self.pending -= 1
+                self.completed += 1
+
+
+password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASHER_MAX_WORKERS,
+                                 max_queue=settings.PASSWORD_HASHER_MAX_QUEUE)
+"""Global password hasher"""
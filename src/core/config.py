@@ -34,6 +34,7 @@ class GlobalSettings(BaseSettings):
     Here, the variables are uppercase because they are treated as global variables, during the running of the app.
     """
     APP_NAME: str = 'salus'
+    DEBUG: bool = False  # development mode: e.g. templates are reloaded when changed
     # database settings
     DATABASE_DIALECT: str
     DATABASE_HOST: str
@@ -41,18 +42,67 @@ class GlobalSettings(BaseSettings):
     DATABASE_NAME: str
     DATABASE_USERNAME: str
     DATABASE_PASSWORD: str
+    DATABASE_ASYNC_DRIVER: str = 'psycopg'  # asyncio driver used by the app (DATABASE_DIALECT backend + this driver)
     # configuration path and files
     PATH_CONFIG: str = str(_root_dir() / Path('conf'))
     LOGGER_CONFIG: str = str(PATH_CONFIG / Path('logger.yaml'))
     # app base paths / directories
     ROOT_DIR: str = _root_dir()
     PATH_LOGS: str = str(Path(ROOT_DIR) / 'logs')
+    # Compiled templates (Jinja bytecode), shared by all the workers
+    TEMPLATES_CACHE_DIR: str = str(Path(ROOT_DIR) / 'cache' / 'jinja')
+    # Static assets build (precompressed variants and fingerprints manifest); see scripts/build_static.py
+    STATIC_BUILD_DIR: str = str(Path(ROOT_DIR) / 'cache' / 'static')
+    STATIC_BUILD_ON_STARTUP: bool = False  # False: only load the manifest of the deploy-time build (recommended)
     # middleware and session
     SECRET_KEY: str
+    # Response compression (brotli if installed, else gzip): minimum body size in bytes, and levels
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; higher ones are too slow for pages rendered on each request
+    # Password hashing (bcrypt) pool: concurrent hashes, and calls allowed to wait before rejecting new ones
+    PASSWORD_HASHER_MAX_WORKERS: int = 2
+    PASSWORD_HASHER_MAX_QUEUE: int = 16
+    # Authenticated-user snapshot cache (skips the users lookup on most requests); TTL in seconds, which also bounds
+    # how long a user deactivated in the database stays logged in
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10_000
     # Endotools API settings
     ENDOTOOLS_BASE_URL: str
     ENDOTOOLS_KEY: str
-    ENDOTOOLS_TIMEOUT: int | None = 30
+    ENDOTOOLS_TIMEOUT: int | None = 30  # read/write timeout, in seconds
+    ENDOTOOLS_CONNECT_TIMEOUT: float = 5.0
+    ENDOTOOLS_MAX_CONNECTIONS: int = 20
+    ENDOTOOLS_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    ENDOTOOLS_KEEPALIVE_EXPIRY: float = 30.0
+    ENDOTOOLS_MAX_CONCURRENCY: int = 8  # max parallel upstream calls per request (e.g. report lookups)
+    # Retries of idempotent calls (capped exponential backoff with jitter, in seconds) and circuit breaker
+    ENDOTOOLS_MAX_RETRIES: int = 2
+    ENDOTOOLS_BACKOFF_BASE: float = 0.2
+    ENDOTOOLS_BACKOFF_MAX: float = 2.0
+    ENDOTOOLS_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failures that open the circuit
+    ENDOTOOLS_BREAKER_RESET_TIMEOUT: float = 30.0  # seconds open before letting a probe call through
+    # Reference data cache (insurers, municipalities, provinces), in seconds
+    REFERENCE_CACHE_TTL: int = 6 * 3600  # fresh for 6 hours
+    REFERENCE_CACHE_MAX_STALE: int = 7 * 24 * 3600  # then served stale (refreshed in background) up to 7 days
+    # Per-patient data cache (demographics, appointments, examinations, reports); TTLs in seconds
+    PATIENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PATIENT_CACHE_MAX_ENTRIES: int = 50_000
+    PATIENT_CACHE_TTL_DEMOGRAPHICS: int = 30 * 60
+    PATIENT_CACHE_TTL_APPOINTMENTS: int = 5 * 60
+    PATIENT_CACHE_TTL_EXAMINATIONS: int = 10 * 60
+    PATIENT_CACHE_TTL_REPORTS: int = 5 * 60
+    PATIENT_CACHE_NEGATIVE_TTL: int = 60  # "not found" answers
+    PATIENT_PREFETCH_MAX_PENDING: int = 100  # background post-login warm-ups running at once; beyond, skipped
+    # On-disk cache of examination report PDFs
+    REPORT_CACHE_DIR: str = str(Path(ROOT_DIR) / 'cache' / 'reports')
+    REPORT_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    REPORT_CACHE_TTL: int = 24 * 3600  # seconds; the "last report" of an examination may be replaced
+    REPORT_CACHE_SWEEP_INTERVAL: int = 600  # seconds; expired reports are deleted from disk at most this late
+    # Prometheus metrics endpoint (/metrics), only mounted when enabled and a token is set; scrapes must send
+    # "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str | None = None
 
     @field_validator('ENDOTOOLS_TIMEOUT', mode='before')
     @classmethod
@@ -69,6 +119,9 @@ def global_settings() -> GlobalSettings:
     # Ensure required directories exist at startup
     for path in [
         _settings.PATH_LOGS,
+        _settings.TEMPLATES_CACHE_DIR,
+        _settings.STATIC_BUILD_DIR,
+        _settings.REPORT_CACHE_DIR,
     ]:
         os.makedirs(path, exist_ok=True)
 
@@ -90,6 +143,18 @@ class EmailSettings(BaseSettings):
     EMAIL_STARTTLS: bool
     EMAIL_SSL_TLS: bool
     EMAIL_TEMPLATE_FOLDER: str
+    # SMTP connection pool: open connections, idle seconds before closing one, and before checking it (NOOP) on reuse
+    EMAIL_POOL_SIZE: int = 2
+    EMAIL_POOL_MAX_IDLE: float = 240.0
+    EMAIL_POOL_HEALTH_CHECK_AFTER: float = 15.0
+    # Outbox dispatcher: messages per batch (one SMTP connection), idle polling interval and claim lease (seconds)
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 5.0
+    EMAIL_OUTBOX_LEASE: int = 300
+    # Retries: exponential backoff from EMAIL_OUTBOX_RETRY_DELAY up to EMAIL_OUTBOX_RETRY_MAX_DELAY (seconds)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_RETRY_DELAY: int = 30
+    EMAIL_OUTBOX_RETRY_MAX_DELAY: int = 3600
 
     model_config = SettingsConfigDict(env_ignore_empty=True)
 
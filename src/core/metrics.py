@@ -0,0 +1,184 @@
+import time
+from collections.abc import Callable, Iterable
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.responses import Response
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Metrics of the app's hot paths, exposed on /metrics (see src/routers/metrics.py).
+# Endotools client metrics live with the client (src/infrastructure/external/endotools/metrics.py).
+# Each worker process exposes its own values.
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "salus_http_request_duration_seconds",
+    "HTTP requests until the response is fully sent, by route name, method and status",
+    ["route", "method", "status"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "salus_password_hash_duration_seconds",
+    "bcrypt calls on the password hasher pool (run time, queueing excluded), by operation",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+EMAILS = Counter(
+    "salus_emails_total",
+    "Emails handled, by type and outcome (sent, retry, failed)",
+    ["type", "outcome"],
+)
+SMTP_SEND_SECONDS = Histogram(
+    "salus_smtp_send_duration_seconds",
+    "SMTP message submissions over a pooled connection, by outcome (ok, error)",
+    ["outcome"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class MetricsMiddleware:
+    """ Times every HTTP request into HTTP_REQUEST_SECONDS, labelled with the name of the route that handled it """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._mount_names: dict[int, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500  # if the app fails before starting the response
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(self._route_name(scope), scope["method"], str(status)).observe(
+                time.perf_counter() - start)
+
+    def _route_name(self, scope: Scope) -> str:
+        """ Name of the matched route (set in the scope by the router), or of the mount (e.g. "static") """
+        route = scope.get("route")
+        if route is not None and getattr(route, "name", None):
+            return route.name
+        endpoint = scope.get("endpoint")
+        if endpoint is not None and "app" in scope:
+            if not self._mount_names:
+                self._mount_names = {id(r.app): r.name for r in scope["app"].routes if isinstance(r, Mount) and r.name}
+            name = self._mount_names.get(id(endpoint))
+            if name:
+                return name
+        return "unmatched"  # keeps the label set bounded (no raw paths)
+
+
+class StatsCollector(Collector):
+    """
+    Exposes, at scrape time, the counters and state the app components already keep (pool sizes, cache hits,
+    circuit breakers...). `sources` returns the current objects, e.g. reading them from app.state, so nothing
+    is registered before the lifespan creates them.
+    """
+
+    def __init__(self, sources: Callable[[], dict]):
+        self.sources = sources
+
+    def collect(self) -> Iterable:
+        sources = self.sources()
+
+        engine = sources.get("engine")
+        if engine is not None:
+            pool = engine.sync_engine.pool
+            gauge = GaugeMetricFamily("salus_db_pool_connections", "SQLAlchemy pool connections, by state",
+                                      labels=["state"])
+            for state in ("checkedout", "checkedin", "overflow", "size"):
+                if hasattr(pool, state):
+                    # overflow() is negative while the pool is below its size: only the connections beyond it count
+                    gauge.add_metric([state], max(0, getattr(pool, state)()))
+            yield gauge
+
+        hasher = sources.get("password_hasher")
+        if hasher is not None:
+            stats = hasher.stats()
+            yield _gauge("salus_password_hasher_queue_depth", "Password hash calls waiting for a worker",
+                         stats["queue_depth"])
+            yield _gauge("salus_password_hasher_active", "Password hash calls running", stats["active"])
+            yield _counter("salus_password_hasher_rejected", "Password hash calls rejected (pool saturated)",
+                           stats["rejected"])
+
+        caches = {name: lru for name, lru in sources.get("lru_caches", {}).items() if lru is not None}
+        if caches:
+            requests = CounterMetricFamily("salus_cache_requests", "In-memory cache lookups, by cache and result",
+                                           labels=["cache", "result"])
+            evictions = CounterMetricFamily("salus_cache_evictions", "In-memory cache evictions", labels=["cache"])
+            entries = GaugeMetricFamily("salus_cache_entries", "In-memory cache entries", labels=["cache"])
+            size = GaugeMetricFamily("salus_cache_bytes", "In-memory cache estimated size", labels=["cache"])
+            for name, lru in caches.items():
+                requests.add_metric([name, "hit"], lru.hits)
+                requests.add_metric([name, "miss"], lru.misses)
+                evictions.add_metric([name], lru.evictions)
+                entries.add_metric([name], len(lru))
+                size.add_metric([name], lru.current_bytes)
+            yield from (requests, evictions, entries, size)
+
+        client = sources.get("endotools_client")
+        if client is not None:
+            flights = CounterMetricFamily("salus_endotools_single_flight", "Endotools single-flight calls, by kind",
+                                          labels=["kind"])
+            for kind, value in client.single_flight_stats.as_dict().items():
+                flights.add_metric([kind], value)
+            yield flights
+            state = GaugeMetricFamily("salus_endotools_circuit_state",
+                                      "Endotools circuit breakers: 1 for the current state", labels=["endpoint", "state"])
+            rejected = CounterMetricFamily("salus_endotools_circuit_rejected",
+                                           "Endotools calls rejected by an open circuit", labels=["endpoint"])
+            for name, breaker in client.circuit_breakers.items():
+                state.add_metric([name, breaker.state.value], 1)
+                rejected.add_metric([name], breaker.rejected)
+            yield from (state, rejected)
+
+        prefetcher = sources.get("patient_prefetcher")
+        if prefetcher is not None:
+            yield _counter("salus_patient_prefetch_scheduled", "Post-login patient prefetches started",
+                           prefetcher.scheduled)
+            yield _counter("salus_patient_prefetch_skipped", "Post-login patient prefetches skipped (too many running)",
+                           prefetcher.skipped)
+
+        smtp_pool = sources.get("smtp_pool")
+        if smtp_pool is not None:
+            stats = smtp_pool.stats()
+            connections = CounterMetricFamily("salus_smtp_connections", "SMTP connections, by event",
+                                              labels=["event"])
+            for event in ("created", "reused", "health_check_failures"):
+                connections.add_metric([event], stats[event])
+            yield connections
+            yield _gauge("salus_smtp_idle_connections", "Idle pooled SMTP connections", stats["idle"])
+
+
+def _gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, value=value)
+
+
+def _counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, value=value)
+
+
+def register_stats_collector(sources: Callable[[], dict]) -> StatsCollector:
+    collector = StatsCollector(sources)
+    REGISTRY.register(collector)
+    return collector
+
+
+def unregister_stats_collector(collector: StatsCollector) -> None:
+    REGISTRY.unregister(collector)
+
+
+def metrics_response() -> Response:
+    """ Current metrics, in the Prometheus text exposition format """
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Connection, inspect, text
+
+from src.core.config import logger
+from src.core.database import Base, async_engine
+from src.models import Patient
+
+# Columns added to existing tables after they were first created. There are no migrations, and create_all only
+# creates the missing tables: these columns are added at startup when missing. Value: what to do next, if anything.
+ADDED_COLUMNS: dict[Column, str] = {
+    Patient.__table__.c.external_id: "fill it for the existing patients with scripts/backfill_patient_external_id.py",
+}
+
+
+def add_missing_columns(connection: Connection) -> list[Column]:
+    """ Add the ADDED_COLUMNS missing from their (existing) table; returns the added ones """
+    inspector = inspect(connection)
+    added = []
+    for column in ADDED_COLUMNS:
+        table = column.table.name
+        if not inspector.has_table(table):
+            continue  # created with all its columns by create_all
+        if column.name in {c["name"] for c in inspector.get_columns(table)}:
+            continue
+        column_type = column.type.compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type}"))
+        added.append(column)
+    return added
+
+
+def _upgrade(connection: Connection) -> list[Column]:
+    Base.metadata.create_all(connection)
+    return add_missing_columns(connection)
+
+
+async def upgrade_schema() -> None:
+    """
+    Called from the app lifespan, before anything queries the database: create the missing tables (e.g.
+    email_outbox) and add the missing columns the code selects, so an upgraded app does not fail on every request.
+    Fails the startup, with the reason, if the database cannot be upgraded.
+    """
+    for attempt in range(2):  # another worker starting at the same time may win the race: check again
+        try:
+            async with async_engine.begin() as connection:
+                added = await connection.run_sync(_upgrade)
+            break
+        except Exception as e:
+            if attempt:
+                raise RuntimeError(f"Database schema upgrade failed, missing tables or columns could not be "
+                                   f"created: {e}") from e
+    for column in added:
+        logger.warning(f"Added missing column {column.table.name}.{column.name}: {ADDED_COLUMNS[column]}")
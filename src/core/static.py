@@ -0,0 +1,18 @@
+from src.core.config import settings, logger
+from src.lib.static import PrecompressedStaticFiles
+
+static_files = PrecompressedStaticFiles(
+    directory="/".join((settings.ROOT_DIR, "src/static")),
+    build_dir=settings.STATIC_BUILD_DIR,
+)
+
+
+def prepare_static_files() -> None:
+    """ Called from the app lifespan: build the static assets (only changed files), or load the deploy-time build """
+    if settings.STATIC_BUILD_ON_STARTUP:
+        static_files.build()
+    else:
+        static_files.load_manifest()
+        if not static_files.manifest.files:
+            logger.warning(f"No static assets build in {settings.STATIC_BUILD_DIR}: static files are served without "
+                           f"fingerprints or precompressed variants. Run scripts/build_static.py when deploying")
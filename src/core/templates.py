@@ -1,6 +1,114 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, pass_context
+from starlette.datastructures import URL
+from starlette.responses import HTMLResponse, StreamingResponse
+
+from src.core.config import settings, logger
+from src.core.static import static_files
+
+
+def bytecode_cache(cache_name: str) -> FileSystemBytecodeCache:
+    """
+    On-disk cache of compiled templates (TEMPLATES_CACHE_DIR/cache_name), shared by every worker and across
+    restarts. The cache key ignores the environment options, so `cache_name` must be unique per environment
+    configuration (e.g. sync/async, as the compiled code differs).
+    """
+    cache_dir = os.path.join(settings.TEMPLATES_CACHE_DIR, cache_name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return FileSystemBytecodeCache(cache_dir)
+
+
+def create_template_environment(directory: str, cache_name: str, **options) -> Environment:
+    """
+    Jinja environment backed by a bytecode cache: templates are only compiled when their source changes, and
+    only checked for changes in DEBUG mode.
+    """
+    return Environment(
+        loader=FileSystemLoader(directory),
+        bytecode_cache=bytecode_cache(cache_name),
+        auto_reload=settings.DEBUG,
+        **options,
+    )
+
+
+def precompile_templates(env: Environment) -> int:
+    """ Load (compile or read from the bytecode cache) every template of `env`, before the first request needs it """
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+@pass_context
+def url_for(context: dict[str, Any], name: str, /, **path_params: Any) -> URL:
+    """ Starlette's url_for, with fingerprinted static file paths (cached by browsers as immutable) """
+    if name == "static" and "path" in path_params:
+        path_params["path"] = static_files.url_path(path_params["path"])
+    return context["request"].url_for(name, **path_params)
 
-from src.core.config import settings
 
 directory = "/".join((settings.ROOT_DIR, "src/templates"))
-templates = Jinja2Templates(directory=directory)
+_env = create_template_environment(directory, "pages", autoescape=True)
+_env.globals["url_for"] = url_for
+templates = Jinja2Templates(env=_env)
+
+# Async twin of the templates environment (same loader, filters and globals, e.g. url_for), used to render the pages
+# (render_template, stream_template): templates can then iterate async iterators, and await async calls.
+async_env = templates.env.overlay(enable_async=True, bytecode_cache=bytecode_cache("pages-async"))
+
+
+def precompile_page_templates() -> None:
+    """ Called from the app lifespan: compile the page templates, for both sync and streamed rendering """
+    count = precompile_templates(templates.env)
+    precompile_templates(async_env)
+    logger.info(f"Precompiled {count} page templates")
+
+
+async def render_template(name: str, context: dict[str, Any], status_code: int = 200,
+                          headers: dict[str, str] | None = None) -> HTMLResponse:
+    """ Like templates.TemplateResponse, rendered with the async environment """
+    content = await async_env.get_template(name).render_async(context)
+    return HTMLResponse(content, status_code=status_code, headers=headers)
+
+
+async def _render_chunks(name: str, context: dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Render `name` with the async environment, yielding the output in batches. Rendering runs ahead in a task;
+    everything rendered so far is flushed whenever the template is waiting for data (e.g. the next row of an
+    async iterator), so the client gets the page shell at once, and one chunk per batch of rows after.
+    """
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def render():
+        try:
+            async for chunk in async_env.get_template(name).generate_async(context):
+                queue.put_nowait(chunk)
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(render())
+    try:
+        done = False
+        while not done:
+            chunks = [await queue.get()]
+            while not queue.empty():
+                chunks.append(queue.get_nowait())
+            if chunks[-1] is None:
+                chunks.pop()
+                done = True
+            if chunks:
+                yield "".join(chunks)
+        await task  # re-raise rendering errors
+    finally:
+        task.cancel()
+
+
+def stream_template(name: str, context: dict[str, Any], status_code: int = 200) -> StreamingResponse:
+    """ Like templates.TemplateResponse, but streamed while rendering (see _render_chunks) """
+    return StreamingResponse(_render_chunks(name, context), status_code=status_code,
+                             media_type="text/html; charset=utf-8")
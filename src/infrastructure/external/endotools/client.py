@@ -1,31 +1,106 @@
+import asyncio
 import httpx
 from collections.abc import AsyncIterator
+from typing import TypeVar
+
+from pydantic import BaseModel, ValidationError
 
 from .schemas import DemographicsDTO, AppointmentDTO, ExaminationDTO, ReportDTO, ProvinceDTO, MunicipalityDTO, \
-    InsurerDTO, CreatePatientRequest, CreatePatientResponse
+    InsurerDTO, CreatePatientRequest, CreatePatientResponse, AppointmentListAdapter, ExaminationListAdapter, \
+    ReportListAdapter, ProvinceListAdapter, MunicipalityListAdapter, InsurerListAdapter
+from .resilience import CircuitBreaker, RetryPolicy
+from .metrics import instrumented, record_response
+from .singleflight import SingleFlight, SingleFlightStats, single_flight
+from .streaming import JSONArrayStreamDecoder
 from .exceptions import (
     ExternalAPIError, ExternalAPITimeoutError, ExternalAPINotFoundError,
     ExternalAPIAuthenticationError, ExternalAPIPermissionError, ExternalAPIServerError
 )
 from src.core.config import logger
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 class EndotoolsAPIClient:
-    def __init__(self, base_url: str, auth_key: str, timeout: int = 30):
+    """
+    Endotools REST API client.
+    A single instance lives for the whole application lifetime (see `lifespan` in main.py), so the underlying
+    httpx connection pool is shared by every request and upstream connections are kept alive and reused.
+    The async context manager protocol opens and closes that pool.
+
+    Idempotent GETs are decorated with @single_flight: concurrent identical calls (same path and params) share
+    a single upstream request and its parsed result.
+
+    Every call goes through a circuit breaker per endpoint family (e.g. "pacientes", "exploraciones/informes"),
+    so an unhealthy Endotools makes calls fail fast with ExternalAPICircuitOpenError instead of waiting for the
+    timeout. GETs are retried on timeouts, network errors and 5xx, following `retry_policy`.
+
+    Large collections can also be streamed (stream_* methods): array elements are decoded as they arrive and
+    yielded as DTOs, so memory stays flat whatever the response size. Streams are neither coalesced nor retried.
+    """
+
+    def __init__(self, base_url: str, auth_key: str, timeout: int = 30, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0, connect_timeout: float = 5.0,
+                 retry_policy: RetryPolicy | None = None, breaker_failure_threshold: int = 5,
+                 breaker_reset_timeout: float = 30.0):
         self._base_url = base_url
         self._headers = {"cookie": f"i18next=es; authkit={auth_key}"}
-        self._timeout = timeout
+        # Read/write/pool timeouts use `timeout`; connecting gets its own, shorter one
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._single_flight = SingleFlight()
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_reset_timeout = breaker_reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
 
     async def __aenter__(self):
         self._client = httpx.AsyncClient(
             base_url=self._base_url,
             timeout=self._timeout,
-            headers=self._headers
+            headers=self._headers,
+            limits=self._limits,
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self._client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        """ Shared, pooled httpx client. Only available between __aenter__ and __aexit__ """
+        if self._client is None:
+            raise RuntimeError("EndotoolsAPIClient is not open. Use it as an async context manager.")
+        return self._client
+
+    @property
+    def single_flight_stats(self) -> SingleFlightStats:
+        """ Request coalescing counters (calls, upstream, hits, coalesced) """
+        return self._single_flight.stats
+
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """ Circuit breakers created so far, by endpoint family """
+        return self._breakers
+
+    def _breaker_for(self, path: str) -> CircuitBreaker:
+        """ Endpoint family: path resources without ids, extensions or special segments (e.g. "_LAST.pdf") """
+        family = "/".join(
+            segment.split(".")[0] for segment in path.strip("/").split("/")[1:]
+            if not segment.isdigit() and not segment.startswith("_")
+        )
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = CircuitBreaker(family, self._breaker_failure_threshold, self._breaker_reset_timeout)
+            self._breakers[family] = breaker
+        return breaker
 
     def _handle_response_error(self, response: httpx.Response):
         """Handle HTTP response errors and raise appropriate exceptions"""
@@ -45,24 +120,113 @@ class EndotoolsAPIClient:
             logger.error(f"API error: {response.status_code} for {response.url}")
             raise ExternalAPIError(f"API error: {response.status_code}")
 
-    async def get_demographics(self, mrn: str) -> DemographicsDTO:
+    async def _send(self, method: str, path: str, params: dict | None = None, retry: bool = False) -> httpx.Response:
+        """
+        Send a request on the shared connection pool, through the endpoint circuit breaker, raising the mapped
+        exception on non-success responses. With `retry`, timeouts, network errors and 5xx are retried.
+        The breaker judges the call as a whole: one failure once the retries run out, or one success.
+        httpx transport exceptions are left to the caller, as before.
+        """
+        breaker = self._breaker_for(path)
+        attempts = self._retry_policy.max_retries + 1 if retry else 1
+        breaker.before_call()
+        judged = False
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/pacientes.json", params={"idunico": mrn, "deshabilitado": 0})
+            for attempt in range(attempts):
+                last_attempt = attempt + 1 == attempts
+                try:
+                    resp = await self._http.request(method, path, params=params)
+                except (httpx.TimeoutException, httpx.NetworkError):
+                    record_response(breaker.name, "error")
+                    if last_attempt:
+                        judged = True
+                        breaker.record_failure()
+                        raise
+                else:
+                    record_response(breaker.name, resp.status_code)
+                    if resp.status_code < 500:
+                        judged = True
+                        breaker.record_success()
+                        if not resp.is_success:
+                            self._handle_response_error(resp)
+                        return resp
+                    if last_attempt:
+                        judged = True
+                        breaker.record_failure()
+                        self._handle_response_error(resp)
+
+                delay = self._retry_policy.backoff(attempt)
+                logger.warning(f"Retrying {method} {path} in {delay:.2f}s (attempt {attempt + 2} of {attempts})")
+                await asyncio.sleep(delay)
+        finally:
+            if not judged:
+                breaker.release()
+
+    async def _get(self, path: str, params: dict | None = None) -> httpx.Response:
+        """ Idempotent GET, retried on transient failures """
+        return await self._send("GET", path, params=params, retry=True)
+
+    async def _stream(self, path: str, params: dict | None = None) -> AsyncIterator[bytes]:
+        """
+        Streamed GET on the shared connection pool, through the endpoint circuit breaker, raising the mapped
+        exception on non-success responses. Streamed, so not retried; the breaker only judges the response
+        status (or the failure to get one). httpx transport exceptions are left to the caller.
+        """
+        breaker = self._breaker_for(path)
+        breaker.before_call()
+        judged = False
+        try:
+            async with self._http.stream("GET", path, params=params) as resp:
+                judged = True
+                record_response(breaker.name, resp.status_code)
+                if resp.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
                 if not resp.is_success:
                     self._handle_response_error(resp)
+                async for chunk in resp.aiter_bytes():
+                    yield chunk
+        except (httpx.TimeoutException, httpx.NetworkError):
+            if not judged:
+                judged = True
+                breaker.record_failure()
+                record_response(breaker.name, "error")
+            raise
+        finally:
+            if not judged:
+                breaker.release()
+
+    async def _stream_list(self, path: str, params: dict | None, model: type[ModelT]) -> AsyncIterator[ModelT]:
+        """ Stream a JSON array response, yielding each element validated as `model` as soon as it is complete """
+        decoder = JSONArrayStreamDecoder()
+        try:
+            async for chunk in self._stream(path, params):
+                for element in decoder.feed(chunk):
+                    yield model.model_validate_json(element)
+            decoder.close()
+        except ValueError as e:
+            if isinstance(e, ValidationError):
+                raise
+            logger.error(f"Malformed JSON array streamed from {path}: {e}")
+            raise ExternalAPIError(f"Unexpected response format: {e}")
+
+    @instrumented
+    @single_flight
+    async def get_demographics(self, mrn: str) -> DemographicsDTO:
+        try:
+            resp = await self._get("/rest/pacientes.json", params={"idunico": mrn, "deshabilitado": 0})
 
-                data = resp.json()
-                # Normalize API
-                if isinstance(data, list):
-                    if not data:
-                        raise ExternalAPINotFoundError(f"No demographics found for MRN: {mrn}")
-                    data = data[0]
-                if not isinstance(data, dict):
-                    raise ExternalAPIError(f"Unexpected response format for MRN {mrn}:  {type(data).__name__}")
+            data = resp.json()
+            # Normalize API
+            if isinstance(data, list):
+                if not data:
+                    raise ExternalAPINotFoundError(f"No demographics found for MRN: {mrn}")
+                data = data[0]
+            if not isinstance(data, dict):
+                raise ExternalAPIError(f"Unexpected response format for MRN {mrn}:  {type(data).__name__}")
 
-                return DemographicsDTO.model_validate(data)
+            return DemographicsDTO.model_validate(data)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting demographics for MRN: {mrn}")
             raise ExternalAPITimeoutError("Request timed out")
@@ -70,15 +234,12 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting demographics for MRN {mrn}: {e}")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    @single_flight
     async def get_appointments(self, mrn: str) -> list[AppointmentDTO]:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/citas.json", params={"id_unico_paciente": mrn})
-                print("RESP", resp)
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                return [AppointmentDTO.model_validate(a) for a in resp.json()]
+            resp = await self._get("/rest/citas.json", params={"id_unico_paciente": mrn})
+            return AppointmentListAdapter.validate_json(resp.content)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting appointments for MRN: {mrn}")
             raise ExternalAPITimeoutError("Request timed out")
@@ -86,15 +247,12 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting appointments for MRN {mrn}: {e}")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    @single_flight
     async def get_examinations(self, patient_id: int) -> list[ExaminationDTO]:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/exploraciones.json",
-                                        params={"estado": 1, "paciente_id": str(patient_id)})
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                return [ExaminationDTO.model_validate(e) for e in resp.json()]
+            resp = await self._get("/rest/exploraciones.json", params={"estado": 1, "paciente_id": str(patient_id)})
+            return ExaminationListAdapter.validate_json(resp.content)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting examinations for patient ID: {patient_id}")
             raise ExternalAPITimeoutError("Request timed out")
@@ -102,14 +260,12 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting examinations for patient ID {patient_id}: {e}")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    @single_flight
     async def get_reports(self, exploracion_id: int) -> list[ReportDTO]:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/informes.json", params={"exploracion_id": str(exploracion_id)})
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                return [ReportDTO.model_validate(r) for r in resp.json()]
+            resp = await self._get("/rest/informes.json", params={"exploracion_id": str(exploracion_id)})
+            return ReportListAdapter.validate_json(resp.content)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting reports for exploration ID: {exploracion_id}")
             raise ExternalAPITimeoutError("Request timed out")
@@ -117,16 +273,12 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting reports for exploration ID {exploracion_id}: {e}")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
     async def get_last_report(self, exploration_id: int) -> AsyncIterator[bytes]:
         """ Stream examination last report """
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                async with client.stream("GET", f"/rest/exploraciones/{exploration_id}/informes/_LAST.pdf", ) as resp:
-                    if not resp.is_success:
-                        self._handle_response_error(resp)
-                    async for chunk in resp.aiter_bytes():
-                        yield chunk
+            async for chunk in self._stream(f"/rest/exploraciones/{exploration_id}/informes/_LAST.pdf"):
+                yield chunk
         except httpx.TimeoutException:
             logger.error(f"Timeout getting last report for exploration ID: {exploration_id}")
             raise ExternalAPITimeoutError("Request timed out")
@@ -134,14 +286,55 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting last report for exploration ID {exploration_id}: {e}")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    async def stream_appointments(self, mrn: str) -> AsyncIterator[AppointmentDTO]:
+        """ Streaming variant of get_appointments: DTOs are yielded while the response is still downloading """
+        try:
+            async for appointment in self._stream_list("/rest/citas.json", {"id_unico_paciente": mrn},
+                                                       AppointmentDTO):
+                yield appointment
+        except httpx.TimeoutException:
+            logger.error(f"Timeout streaming appointments for MRN: {mrn}")
+            raise ExternalAPITimeoutError("Request timed out")
+        except httpx.RequestError as e:
+            logger.error(f"Request error streaming appointments for MRN {mrn}: {e}")
+            raise ExternalAPIError(f"Request failed: {e}")
+
+    @instrumented
+    async def stream_examinations(self, patient_id: int) -> AsyncIterator[ExaminationDTO]:
+        """ Streaming variant of get_examinations: DTOs are yielded while the response is still downloading """
+        try:
+            async for examination in self._stream_list("/rest/exploraciones.json",
+                                                       {"estado": 1, "paciente_id": str(patient_id)},
+                                                       ExaminationDTO):
+                yield examination
+        except httpx.TimeoutException:
+            logger.error(f"Timeout streaming examinations for patient ID: {patient_id}")
+            raise ExternalAPITimeoutError("Request timed out")
+        except httpx.RequestError as e:
+            logger.error(f"Request error streaming examinations for patient ID {patient_id}: {e}")
+            raise ExternalAPIError(f"Request failed: {e}")
+
+    @instrumented
+    async def stream_reports(self, exploracion_id: int) -> AsyncIterator[ReportDTO]:
+        """ Streaming variant of get_reports: DTOs are yielded while the response is still downloading """
+        try:
+            async for report in self._stream_list("/rest/informes.json", {"exploracion_id": str(exploracion_id)},
+                                                  ReportDTO):
+                yield report
+        except httpx.TimeoutException:
+            logger.error(f"Timeout streaming reports for exploration ID: {exploracion_id}")
+            raise ExternalAPITimeoutError("Request timed out")
+        except httpx.RequestError as e:
+            logger.error(f"Request error streaming reports for exploration ID {exploracion_id}: {e}")
+            raise ExternalAPIError(f"Request failed: {e}")
+
+    @instrumented
+    @single_flight
     async def get_provinces(self) -> list[ProvinceDTO]:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/poblaciones.json",)
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                return [ProvinceDTO.model_validate(r) for r in resp.json()]
+            resp = await self._get("/rest/poblaciones.json")
+            return ProvinceListAdapter.validate_json(resp.content)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting provinces from endotools")
             raise ExternalAPITimeoutError("Request timed out")
@@ -149,14 +342,12 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting provinces")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    @single_flight
     async def get_municipalities(self) -> list[MunicipalityDTO]:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/provincias.json",)
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                return [MunicipalityDTO.model_validate(r) for r in resp.json()]
+            resp = await self._get("/rest/provincias.json")
+            return MunicipalityListAdapter.validate_json(resp.content)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting municipalities from endotools")
             raise ExternalAPITimeoutError("Request timed out")
@@ -164,14 +355,12 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting municipalities")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    @single_flight
     async def get_insurers(self) -> list[InsurerDTO]:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/aseguradoras.json", params={"activo": 1})
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                return [InsurerDTO.model_validate(r) for r in resp.json()]
+            resp = await self._get("/rest/aseguradoras.json", params={"activo": 1})
+            return InsurerListAdapter.validate_json(resp.content)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting insurers from endotools")
             raise ExternalAPITimeoutError("Request timed out")
@@ -179,6 +368,7 @@ class EndotoolsAPIClient:
             logger.error(f"Request error getting insurers")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
     async def create_patient(self, patient_data: CreatePatientRequest) -> CreatePatientResponse:
         """
         Create a new patient in Endotools.
@@ -188,17 +378,14 @@ class EndotoolsAPIClient:
             CreatePatientResponse with the created patient ID
         """
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                # Convert the model to dict and prepare as query params
-                params = patient_data.model_dump()
-                
-                resp = await client.post("/rest/pacientes.json", params=params)
-                if not resp.is_success:
-                    self._handle_response_error(resp)
-                
-                data = resp.json()
-                return CreatePatientResponse.model_validate(data)
+            # Convert the model to dict and prepare as query params
+            params = patient_data.model_dump()
+
+            # Not idempotent: never retried
+            resp = await self._send("POST", "/rest/pacientes.json", params=params)
+
+            data = resp.json()
+            return CreatePatientResponse.model_validate(data)
         except httpx.TimeoutException:
             logger.error(f"Timeout creating patient in endotools")
             raise ExternalAPITimeoutError("Request timed out")
@@ -206,27 +393,25 @@ class EndotoolsAPIClient:
             logger.error(f"Request error creating patient: {e}")
             raise ExternalAPIError(f"Request failed: {e}")
 
+    @instrumented
+    @single_flight
     async def get_patient_by_document(self, id_document_number: str) -> DemographicsDTO:
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout,
-                                         headers=self._headers) as client:
-                resp = await client.get("/rest/pacientes.json", params={"DNI": id_document_number, "deshabilitado": 0})
-                if not resp.is_success:
-                    self._handle_response_error(resp)
+            resp = await self._get("/rest/pacientes.json", params={"DNI": id_document_number, "deshabilitado": 0})
+
+            data = resp.json()
+            # Normalize API
+            if isinstance(data, list):
+                if not data:
+                    raise ExternalAPINotFoundError(f"No patient found with identification: {id_document_number}")
+                if len(data) > 1:
+                    logger.error(f"Multiple patients found with same identification: {id_document_number} (count: {len(data)})")
+                    raise ExternalAPIError(f"Multiple patients found with identification: {id_document_number}")
+                data = data[0]
+            if not isinstance(data, dict):
+                raise ExternalAPIError(f"Unexpected response format for patient {id_document_number}:  {type(data).__name__}")
 
-                data = resp.json()
-                # Normalize API
-                if isinstance(data, list):
-                    if not data:
-                        raise ExternalAPINotFoundError(f"No patient found with identification: {id_document_number}")
-                    if len(data) > 1:
-                        logger.error(f"Multiple patients found with same identification: {id_document_number} (count: {len(data)})")
-                        raise ExternalAPIError(f"Multiple patients found with identification: {id_document_number}")
-                    data = data[0]
-                if not isinstance(data, dict):
-                    raise ExternalAPIError(f"Unexpected response format for patient {id_document_number}:  {type(data).__name__}")
-
-                return DemographicsDTO.model_validate(data)
+            return DemographicsDTO.model_validate(data)
         except httpx.TimeoutException:
             logger.error(f"Timeout getting patient: {id_document_number}")
             raise ExternalAPITimeoutError("Request timed out")
@@ -26,3 +26,8 @@ class ExternalAPIPermissionError(ExternalAPIError):
 class ExternalAPIServerError(ExternalAPIError):
     """Raised when server error occurs (5xx)"""
     pass
+
+
+class ExternalAPICircuitOpenError(ExternalAPIError):
+    """Raised without calling the API while its circuit breaker is open"""
+    pass
@@ -0,0 +1,66 @@
+import functools
+import inspect
+import time
+from collections.abc import Callable
+
+from prometheus_client import Counter, Histogram
+
+CALL_SECONDS = Histogram(
+    "salus_endotools_call_duration_seconds",
+    "Endotools client calls, by method and outcome (ok, or the exception class); streams until consumed",
+    ["method", "outcome"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+RESPONSES = Counter(
+    "salus_endotools_responses_total",
+    "Endotools HTTP responses (every attempt, retries included), by endpoint family and status code",
+    ["endpoint", "status"],
+)
+
+
+def record_response(endpoint: str, status: int | str) -> None:
+    """ One upstream attempt: its HTTP status, or "error" when no response came (timeout, network error) """
+    RESPONSES.labels(endpoint, str(status)).inc()
+
+
+def instrumented(method: Callable) -> Callable:
+    """
+    Time each call of an EndotoolsAPIClient method into CALL_SECONDS, labelled with its outcome.
+    Works for coroutine methods and for streaming ones (async generators), timed until exhausted or closed.
+    """
+    name = method.__name__
+
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def stream_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "ok"
+            stream = method(*args, **kwargs)
+            try:
+                async for item in stream:
+                    yield item
+            except GeneratorExit:
+                outcome = "closed"  # consumer stopped early (e.g. client disconnected)
+                raise
+            except BaseException as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                await stream.aclose()
+                CALL_SECONDS.labels(name, outcome).observe(time.perf_counter() - start)
+
+        return stream_wrapper
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await method(*args, **kwargs)
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            CALL_SECONDS.labels(name, outcome).observe(time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,81 @@
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+from .exceptions import ExternalAPICircuitOpenError
+from src.core.config import logger
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"  # normal operation
+    OPEN = "open"  # failing fast, no call reaches the API
+    HALF_OPEN = "half_open"  # reset timeout elapsed, a single probe call is allowed through
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint family of an external API.
+    After `failure_threshold` consecutive failures (timeouts, network errors, 5xx) the circuit opens and calls fail
+    immediately with ExternalAPICircuitOpenError. After `reset_timeout` seconds one probe call is let through:
+    success closes the circuit, failure opens it again.
+
+    Usage: before_call() then exactly one of record_success(), record_failure() or release().
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self._reject()
+            self.state = CircuitState.HALF_OPEN
+            logger.info(f"Circuit '{self.name}' half-open, probing")
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                self._reject()
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state != CircuitState.CLOSED:
+            logger.warning(f"Circuit '{self.name}' closed")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                logger.error(f"Circuit '{self.name}' opened after {self.failures} consecutive failures")
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """ The call ended without telling anything about the API health (e.g. it was cancelled) """
+        self._probe_in_flight = False
+
+    def _reject(self):
+        self.rejected += 1
+        raise ExternalAPICircuitOpenError(f"Circuit '{self.name}' is open")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """ Retries for idempotent calls, with capped exponential backoff and full jitter """
+    max_retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 2.0
+
+    def backoff(self, attempt: int) -> float:
+        """ Seconds to wait after the failed attempt number `attempt` (0-based) """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
@@ -1,5 +1,8 @@
 from datetime import date, time, datetime
-from pydantic import BaseModel, model_validator, ConfigDict
+from typing import Annotated, Any
+
+from pydantic import BaseModel, ConfigDict, Field, AliasPath, TypeAdapter, ValidationError, \
+    ValidatorFunctionWrapHandler, WrapValidator
 
 from src.core.config import logger
 
@@ -26,6 +29,39 @@ class CreatePatientResponse(BaseModel):
     id: str
 
 
+def _lenient_date(value: Any, handler: ValidatorFunctionWrapHandler) -> date | None:
+    """ ISO dates are parsed by pydantic-core; DD/MM/YYYY is the fallback; empty or invalid values become None """
+    if value in (None, ""):
+        return None
+    try:
+        return handler(value)
+    except ValidationError:
+        pass
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, "%d/%m/%Y").date()
+        except ValueError:
+            pass
+    logger.warning("Invalid date received: %r", value)
+    return None
+
+
+def _lenient_time(value: Any, handler: ValidatorFunctionWrapHandler) -> time | None:
+    """ HH:MM[:SS] is parsed by pydantic-core; empty or invalid values become None """
+    if value in (None, ""):
+        return None
+    try:
+        return handler(value)
+    except ValidationError:
+        logger.warning("Invalid time received: %r", value)
+        return None
+
+
+# Endotools sends dates as YYYY-MM-DD or DD/MM/YYYY, and "" for missing values
+LenientDate = Annotated[date | None, WrapValidator(_lenient_date)]
+LenientTime = Annotated[time | None, WrapValidator(_lenient_time)]
+
+
 class DemographicsDTO(BaseModel):
     model_config = ConfigDict(
         extra="ignore"
@@ -36,34 +72,9 @@ class DemographicsDTO(BaseModel):
     nombre: str
     apellido1: str | None = None
     apellido2: str | None = None
-    fechaNacimiento: date | None = None
+    fechaNacimiento: LenientDate = None
     sexo: str | None = None
 
-    # Pre-processing validator for the whole model, before Pydantic parsing
-    @model_validator(mode="before")
-    def preprocess_fields(cls, values: dict) -> dict:
-        dob = values.get("fechaNacimiento")
-
-        if dob in (None, ""):
-            values["fechaNacimiento"] = None
-            return values
-
-        if isinstance(dob, date):
-            values["fechaNacimiento"] = dob
-            return values
-
-        # Try known formats
-        for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-            try:
-                values["fechaNacimiento"] = datetime.strptime(dob, fmt).date()
-                return values
-            except ValueError:
-                continue
-
-        logger.warning("Invalid fechaNacimiento received: %r", dob)
-        values["fechaNacimiento"] = None
-        return values
-
 
 class AppointmentDTO(BaseModel):
     model_config = ConfigDict(
@@ -71,57 +82,11 @@ class AppointmentDTO(BaseModel):
     )
 
     id: int
-    fecha: date | None = None
-    hora: time | None = None
+    fecha: LenientDate = None
+    hora: LenientTime = None
     exploracion_id: int | None = None
-    tipo_exploracion: str | None = None
-
-    @model_validator(mode="before")
-    def preprocess_fields(cls, values: dict) -> dict:
-        # --- Extract tipo_exploracion.nombre ---
-        tipo = values.get("tipoExploracion")
-        if isinstance(tipo, dict):
-            values["tipo_exploracion"] = tipo.get("nombre")
-        else:
-            values["tipo_exploracion"] = None
-
-        # --- Parse fecha ---
-        f = values.get("fecha")
-        if f in (None, ""):
-            values["fecha"] = None
-        elif isinstance(f, date):
-            values["fecha"] = f
-        else:
-            # try common formats
-            for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-                try:
-                    values["fecha"] = datetime.strptime(f, fmt).date()
-                    break
-                except ValueError:
-                    continue
-            else:
-                logger.warning("Invalid fecha received: %r", f)
-                values["fecha"] = None
-
-        # --- Parse hora ---
-        h = values.get("hora")
-        if h in (None, ""):
-            values["hora"] = None
-        elif isinstance(h, time):
-            values["hora"] = h
-        else:
-            # try parsing HH:MM or HH:MM:SS
-            for fmt in ("%H:%M:%S", "%H:%M"):
-                try:
-                    values["hora"] = datetime.strptime(h, fmt).time()
-                    break
-                except ValueError:
-                    continue
-            else:
-                logger.warning("Invalid hora received: %r", h)
-                values["hora"] = None
-
-        return values
+    # Nested values are picked declaratively (tipoExploracion.nombre), while parsing
+    tipo_exploracion: str | None = Field(None, validation_alias=AliasPath("tipoExploracion", "nombre"))
 
 
 class ExaminationDTO(BaseModel):
@@ -130,53 +95,10 @@ class ExaminationDTO(BaseModel):
     )
 
     id: int
-    fecha: date | None = None
-    servicio: str | None = None
-    tipo: str | None = None
-    medico: str | None = None
-
-    @model_validator(mode="before")
-    def preprocess_fields(cls, values: dict) -> dict:
-        # --- Parse fecha ---
-        f = values.get("fecha")
-        if f in (None, ""):
-            values["fecha"] = None
-        elif isinstance(f, date):
-            values["fecha"] = f
-        else:
-            # try common formats
-            for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-                try:
-                    values["fecha"] = datetime.strptime(f, fmt).date()
-                    break
-                except ValueError:
-                    continue
-            else:
-                logger.warning("Invalid fecha received: %r", f)
-                values["fecha"] = None
-
-        # --- Extract servicio.nombre ---
-        tipo = values.get("servicio")
-        if isinstance(tipo, dict):
-            values["servicio"] = tipo.get("nombre")
-        else:
-            values["servicio"] = None
-
-        # --- Extract tipo_exploracion.nombre ---
-        tipo = values.get("tipoExploracion")
-        if isinstance(tipo, dict):
-            values["tipo"] = tipo.get("nombre")
-        else:
-            values["tipo"] = None
-
-        # --- Extract medico.nombre ---
-        tipo = values.get("medico")
-        if isinstance(tipo, dict):
-            values["medico"] = tipo.get("nombre")
-        else:
-            values["medico"] = None
-
-        return values
+    fecha: LenientDate = None
+    servicio: str | None = Field(None, validation_alias=AliasPath("servicio", "nombre"))
+    tipo: str | None = Field(None, validation_alias=AliasPath("tipoExploracion", "nombre"))
+    medico: str | None = Field(None, validation_alias=AliasPath("medico", "nombre"))
 
 
 class ReportDTO(BaseModel):
@@ -185,38 +107,8 @@ class ReportDTO(BaseModel):
     )
 
     id: str
-    fecha: date | None = None
-    tipo: str | None = None
-
-    @model_validator(mode="before")
-    def preprocess_fields(cls, values: dict) -> dict:
-        # --- Parse fecha ---
-        f = values.get("fecha")
-        if f in (None, ""):
-            values["fecha"] = None
-        elif isinstance(f, date):
-            values["fecha"] = f
-        else:
-            # try common formats
-            for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-                try:
-                    values["fecha"] = datetime.strptime(f, fmt).date()
-                    break
-                except ValueError:
-                    continue
-            else:
-                logger.warning("Invalid fecha received: %r", f)
-                values["fecha"] = None
-
-        # --- Extract tipo_exploracion.nombre ---
-        values["tipo"] = None
-        exploracion = values.get("exploracion")
-        if isinstance(exploracion, dict):
-            tipo = exploracion.get("tipoExploracion")
-            if isinstance(tipo, dict):
-                values["tipo"] = tipo.get("nombre")
-
-        return values
+    fecha: LenientDate = None
+    tipo: str | None = Field(None, validation_alias=AliasPath("exploracion", "tipoExploracion", "nombre"))
 
 
 class ProvinceDTO(BaseModel):
@@ -246,3 +138,12 @@ class InsurerDTO(BaseModel):
 
     id: int
     nombre: str
+
+
+# Bulk parsers of list responses: validate the raw JSON bytes in pydantic-core, without building Python dicts first
+AppointmentListAdapter = TypeAdapter(list[AppointmentDTO])
+ExaminationListAdapter = TypeAdapter(list[ExaminationDTO])
+ReportListAdapter = TypeAdapter(list[ReportDTO])
+ProvinceListAdapter = TypeAdapter(list[ProvinceDTO])
+MunicipalityListAdapter = TypeAdapter(list[MunicipalityDTO])
+InsurerListAdapter = TypeAdapter(list[InsurerDTO])
@@ -0,0 +1,72 @@
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0  # total calls through the group
+    upstream: int = 0  # calls that actually went upstream (one per flight)
+    hits: int = 0  # calls served by joining a flight already in progress
+    coalesced: int = 0  # flights shared by more than one caller
+
+    def as_dict(self) -> dict[str, int]:
+        return {"calls": self.calls, "upstream": self.upstream, "hits": self.hits, "coalesced": self.coalesced}
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls: while a call for a given key is in flight, later callers with the same
+    key await that same call and get its result (or exception) instead of starting a new one.
+    Nothing is kept once the call finishes, so this is not a cache: it only collapses simultaneous calls.
+
+    The call runs in its own task, so a caller being cancelled (e.g. client disconnect) does not cancel the
+    flight for the other callers waiting on it.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.stats.calls += 1
+        task = self._flights.get(key)
+        if task is None:
+            self.stats.upstream += 1
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            self.stats.hits += 1
+            self._waiters[key] += 1
+            if self._waiters[key] == 2:
+                self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+            del self._waiters[key]
+        # Mark the exception as retrieved, in case every caller was cancelled before the flight finished
+        if not task.cancelled():
+            task.exception()
+
+
+def single_flight(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorator for idempotent read methods of a client holding a `SingleFlight` in `self._single_flight`.
+    The flight key is the method name plus its arguments, which identify the upstream path and params.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args: Any) -> T:
+        key = (method.__name__, *args)
+        return await self._single_flight.do(key, lambda: method(self, *args))
+
+    return wrapper
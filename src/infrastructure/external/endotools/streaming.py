@@ -0,0 +1,125 @@
+import re
+
+# Outside strings only these bytes matter; inside a string, only quotes and escapes
+_STRUCTURAL = re.compile(rb'[\[\]{}",]')
+_STRING_END = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\r\n"
+
+
+class JSONArrayStreamDecoder:
+    """
+    Incremental splitter of a top-level JSON array into its elements, fed with arbitrary byte chunks
+    (e.g. httpx `aiter_bytes()`). `feed` returns the raw bytes of every element completed so far, ready for
+    `Model.model_validate_json`; only the element being received is kept in memory, whatever the array size.
+
+    It only tracks nesting and strings to find element boundaries; each element's JSON is validated when parsed.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0  # next byte to scan
+        self._closers: list[int] = []  # expected closing bracket of each open container, innermost last
+        self._in_string = False
+        self._start: int | None = None  # start of the current element (at depth 1, after '[' or ',')
+        self._done = False
+        self._emitted = 0
+
+    @property
+    def _depth(self) -> int:
+        """ 0: before the array, 1: inside the array, >1: inside an element """
+        return len(self._closers)
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        if self._done:
+            if chunk.strip(_WHITESPACE):
+                raise ValueError("Unexpected data after the end of the JSON array")
+            return []
+        self._buffer += chunk
+        elements = self._scan()
+        self._compact()
+        return elements
+
+    def close(self) -> None:
+        """ Check the array was complete """
+        if not self._done:
+            raise ValueError("Truncated JSON array")
+
+    def _scan(self) -> list[bytes]:
+        buffer = self._buffer
+        elements = []
+        pos = self._pos
+        while pos < len(buffer):
+            if self._in_string:
+                match = _STRING_END.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.start()
+                if buffer[pos] == ord("\\"):
+                    if pos + 1 >= len(buffer):
+                        break  # escaped byte still to come: resume from the backslash
+                    pos += 2
+                    continue
+                self._in_string = False
+                pos += 1
+                continue
+
+            if self._depth == 0:
+                stripped = bytes(buffer[pos:]).lstrip(_WHITESPACE)
+                if not stripped:
+                    pos = len(buffer)
+                    break
+                if stripped[:1] != b"[":
+                    raise ValueError("Expected a JSON array")
+                pos = len(buffer) - len(stripped) + 1
+                self._closers.append(ord("]"))
+                self._start = pos
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.start()
+            byte = buffer[pos]
+            if byte == ord('"'):
+                self._in_string = True
+            elif byte in b"[{":
+                self._closers.append(ord("]") if byte == ord("[") else ord("}"))
+            elif byte in b"]}":
+                if self._closers.pop() != byte:
+                    raise ValueError(f"Mismatched {chr(byte)!r} in JSON array")
+                if self._depth == 0:
+                    self._emit(elements, pos, closing=True)
+                    self._done = True
+                    if bytes(buffer[pos + 1:]).strip(_WHITESPACE):
+                        raise ValueError("Unexpected data after the end of the JSON array")
+                    pos = len(buffer)
+                    break
+            elif byte == ord(",") and self._depth == 1:
+                self._emit(elements, pos)
+                self._start = pos + 1
+            pos += 1
+
+        self._pos = pos
+        return elements
+
+    def _emit(self, elements: list[bytes], end: int, closing: bool = False) -> None:
+        element = bytes(self._buffer[self._start:end]).strip(_WHITESPACE)
+        if not element:
+            if closing and not self._emitted:
+                return  # empty array
+            raise ValueError("Empty element in JSON array")  # e.g. [,] or [1,,2] or [1,]: rejected by json.loads too
+        elements.append(element)
+        self._emitted += 1
+
+    def _compact(self) -> None:
+        """ Drop the bytes of already emitted elements """
+        keep_from = self._pos if self._start is None or self._depth == 0 else min(self._start, self._pos)
+        if self._done:
+            keep_from = len(self._buffer)
+        if keep_from:
+            del self._buffer[:keep_from]
+            self._pos -= keep_from
+            if self._start is not None:
+                self._start = max(0, self._start - keep_from)
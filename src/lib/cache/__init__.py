@@ -0,0 +1,13 @@
+from .disk import FileCache
+from .lru import LRUCache, MISSING, estimate_size
+from .memo import RequestMemo
+from .swr import StaleWhileRevalidateCache
+
+__all__ = [
+    "FileCache",
+    "LRUCache",
+    "MISSING",
+    "estimate_size",
+    "RequestMemo",
+    "StaleWhileRevalidateCache",
+]
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from src.core.config import logger
+
+
+class FileCache:
+    """
+    Content-addressed on-disk cache for immutable-ish blobs (e.g. report PDFs).
+
+    Layout under `directory`:
+        objects/<2 hex>/<sha256>   blob, named after the sha256 of its content (identical blobs are stored once)
+        refs/<key>                 text file with the sha256 the key points to; its mtime gives the entry age
+        tmp/                       in-progress writes, and links to the blobs being sent (see checkout)
+    Writes are atomic (temporary file + os.replace), so readers never see a partial blob or ref.
+    Expired refs are deleted when checked out and by sweep() (after each write, and periodically once start() is
+    called), which also deletes the blobs no live ref points to. Blobs are then evicted least-recently-used first (hits refresh
+    their mtime) when the total size exceeds `max_bytes`.
+    """
+
+    _PIN_SUFFIX = ".pin"
+    _GRACE = 60  # seconds; a blob written or read this recently is kept (its ref may not be written yet)
+    _STALE_TMP = 3600  # seconds; leftovers of interrupted writes and unreleased links are removed after this
+
+    def __init__(self, directory: str | Path, max_bytes: int, ttl: float):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._objects = self.directory / "objects"
+        self._refs = self.directory / "refs"
+        self._tmp = self.directory / "tmp"
+        for path in (self._objects, self._refs, self._tmp):
+            path.mkdir(parents=True, exist_ok=True)
+        self._sweeper: asyncio.Task | None = None
+
+    async def checkout(self, key: str) -> Path | None:
+        """
+        Return the path of a private hard link to the cached blob for `key`, or None on a miss (unknown, expired or
+        evicted). The link keeps the content readable even if the blob is evicted meanwhile; pass it to release()
+        once it has been sent.
+        """
+        return await asyncio.to_thread(self._checkout, key)
+
+    async def release(self, path: Path) -> None:
+        """ Drop a link returned by checkout() """
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+    def _checkout(self, key: str) -> Path | None:
+        ref = self._refs / key
+        try:
+            if time.time() - ref.stat().st_mtime > self.ttl:
+                ref.unlink(missing_ok=True)  # its blob is removed by the next sweep, if no other ref uses it
+                return None
+            blob = self._blob_path(ref.read_text().strip())
+            pinned = self._tmp / f"{uuid.uuid4().hex}{self._PIN_SUFFIX}"
+            os.link(blob, pinned)
+            os.utime(pinned)  # same inode as the blob: marks it as recently used, for eviction
+        except (FileNotFoundError, ValueError):
+            return None
+        return pinned
+
+    def start(self, interval: float) -> None:
+        """ Sweep the cache every `interval` seconds, so expired entries leave the disk even without new writes """
+        self._sweeper = asyncio.create_task(self._run_sweeps(interval))
+
+    async def close(self) -> None:
+        """ Stop the periodic sweep (on app shutdown) """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+
+    async def tee(self, key: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Yield `chunks` unchanged while writing them to the cache. The entry is only stored once the whole stream
+        has been consumed; if it fails or the consumer goes away, the partial file is discarded.
+        """
+        digest = hashlib.sha256()
+        tmp_path = self._tmp / uuid.uuid4().hex
+        stored = False
+        f = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+                yield chunk
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(self._store, key, tmp_path, digest.hexdigest())
+            stored = True
+        finally:
+            if not stored:
+                await asyncio.to_thread(self._discard, f, tmp_path)
+
+    @staticmethod
+    def _discard(f: BinaryIO, tmp_path: Path) -> None:
+        f.close()
+        tmp_path.unlink(missing_ok=True)
+
+    def _blob_path(self, digest: str) -> Path:
+        if len(digest) != 64:
+            raise ValueError(f"Invalid digest: {digest!r}")
+        return self._objects / digest[:2] / digest
+
+    def _store(self, key: str, tmp_path: Path, digest: str) -> None:
+        blob = self._blob_path(digest)
+        blob.parent.mkdir(exist_ok=True)
+        if blob.exists():
+            tmp_path.unlink()
+            os.utime(blob)
+        else:
+            os.replace(tmp_path, blob)
+
+        ref_tmp = self._tmp / uuid.uuid4().hex
+        ref_tmp.write_text(digest)
+        os.replace(ref_tmp, self._refs / key)
+        self.sweep()
+
+    async def _run_sweeps(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Report cache sweep failed: {e}")
+
+    def sweep(self) -> None:
+        """ Delete expired refs, blobs no live ref points to and stale temporary files, then evict over `max_bytes` """
+        now = time.time()
+        live = set()
+        for ref in self._refs.iterdir():
+            try:
+                if now - ref.stat().st_mtime > self.ttl:
+                    ref.unlink(missing_ok=True)
+                else:
+                    live.add(ref.read_text().strip())
+            except FileNotFoundError:
+                continue
+
+        for path in self._tmp.iterdir():
+            try:
+                if now - path.stat().st_mtime > self._STALE_TMP:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+        blobs = []
+        total = 0
+        for path in self._objects.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.name not in live and now - stat.st_mtime > self._GRACE:
+                path.unlink(missing_ok=True)
+                logger.info(f"Removed expired cached file {path.name}")
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        # Oldest first. Refs pointing to evicted blobs are treated as misses by checkout().
+        for _mtime, size, path in sorted(blobs):
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted cached file {path.name} ({size} bytes)")
+            if total <= self.max_bytes:
+                break
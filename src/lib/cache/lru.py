@@ -0,0 +1,110 @@
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+MISSING = object()
+"""Returned by LRUCache.get on a miss (None is a legitimate cached value)"""
+
+_ATOMIC = (str, bytes, int, float, bool, type(None))
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Approximate deep size in bytes of a cached value: containers, plain and slotted objects and pydantic models
+    (through their __dict__). Good enough for accounting, not an exact measure.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _ATOMIC):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj))
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if not name.startswith("__"):
+                size += estimate_size(getattr(obj, name, None))
+    return size
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    size: int
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with a per-entry TTL.
+    Bounded both by number of entries and by the estimated memory of the values (`sizeof`); the least
+    recently used entries are evicted first. Values larger than the whole budget are not cached.
+    Not thread-safe: meant to be used from the event loop.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int | None = None,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._sizeof = sizeof
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        size = self._sizeof(value)
+        self.delete(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = _Entry(value=value, expires_at=time.monotonic() + ttl, size=size)
+        self.current_bytes += size
+        self._evict()
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            self.current_bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self.current_bytes -= entry.size
+            self.evictions += 1
@@ -0,0 +1,30 @@
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from .lru import MISSING
+
+
+class RequestMemo:
+    """
+    Memo of async call results for the lifetime of a single HTTP request (see `get_request_memo`).
+    Repeated identical calls within the request are served from memory; only successes are memoized.
+    Nothing is shared across requests, so there is no staleness to manage.
+    """
+
+    def __init__(self):
+        self._results: dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    async def get_or_call(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        value = self._results.get(key, MISSING)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = await fn()
+        self._results[key] = value
+        return value
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.config import logger
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache for small, slowly changing data sets (e.g. reference lists).
+
+    - Fresh (age < ttl): served from memory.
+    - Stale (ttl <= age < ttl + max_stale): served from memory, and a single background refresh is started.
+    - Expired (or missing): loaded synchronously.
+    If a load fails, the last good copy (if any) keeps being served, whatever its age.
+    """
+
+    def __init__(self, ttl: float, max_stale: float):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: dict[Hashable, _Entry] = {}
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                return entry.value
+            if age < self.ttl + self.max_stale:
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        try:
+            return await self._load(key, loader)
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Cache refresh failed for {key!r}, serving last good copy: {e}")
+            return entry.value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    async def close(self) -> None:
+        """ Cancel pending background refreshes (on app shutdown) """
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self._entries[key] = _Entry(value=value, fetched_at=time.monotonic())
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._load(key, loader))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda t: self._on_refresh_done(key, t))
+
+    def _on_refresh_done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh failed for {key!r}, keeping last good copy: {task.exception()}")
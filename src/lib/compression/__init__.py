@@ -0,0 +1,7 @@
+from .encoding import negotiate_encoding
+from .middleware import CompressionMiddleware
+
+__all__ = [
+    "negotiate_encoding",
+    "CompressionMiddleware",
+]
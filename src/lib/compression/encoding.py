@@ -0,0 +1,28 @@
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is used
+    brotli = None
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """ Content codings of an Accept-Encoding header, lowercased, without the explicitly refused ones (q=0) """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        if params and q.replace(".", "").strip("0") == "":
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str, available: list[str]) -> str | None:
+    """ First of `available` (in order of preference) the client accepts; q values other than 0 are ignored """
+    if not available:
+        return None
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in available:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
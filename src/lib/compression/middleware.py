@@ -0,0 +1,128 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .encoding import brotli, negotiate_encoding
+
+# Media types worth compressing; anything else (PDFs, images, archives...) is already compressed, or not text
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class CompressionMiddleware:
+    """
+    Brotli / gzip compression of responses, by Accept-Encoding (brotli preferred, if installed), only for
+    `compressible_types` and bodies of at least `minimum_size` bytes. Responses that already have a Content-Encoding
+    (e.g. precompressed static files), partial (206) responses, and `Cache-Control: no-transform` are left alone.
+
+    Streamed responses (more_body) are compressed chunk by chunk, each one flushed, so the client still receives
+    (and renders) the page progressively.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        compressible_types: tuple[str, ...] = DEFAULT_COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compressible_types = compressible_types
+        self.encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, encoding, send).run(scope, receive)
+
+
+class _CompressionResponder:
+    """ State of one response: holds the start message until the first body chunk shows whether to compress """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._is_compressible(Headers(raw=message["headers"]), message["status"])
+            return
+        if message["type"] != "http.response.body":  # e.g. http.response.pathsend: sent as is
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:  # first body chunk
+            if not self.passthrough and not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True  # too small to be worth it
+            if not self.passthrough:
+                self.compressor = self._create_compressor()
+                body = self._compress(body, finish=not more_body)
+                headers = MutableHeaders(raw=self.start_message["headers"])
+                headers["Content-Encoding"] = self.encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]  # streamed: sent chunked
+                else:
+                    headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+            await self._send_start()
+        elif self.compressor is not None:
+            message = {**message, "body": self._compress(body, finish=not more_body)}
+        await self.send(message)
+
+    def _is_compressible(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) < self.middleware.minimum_size:
+            return False
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type in self.middleware.compressible_types
+
+    async def _send_start(self) -> None:
+        if self.start_message is not None:
+            message, self.start_message = self.start_message, None
+            await self.send(message)
+
+    def _create_compressor(self):
+        if self.encoding == "br":
+            return brotli.Compressor(quality=self.middleware.brotli_quality)
+        return zlib.compressobj(self.middleware.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def _compress(self, data: bytes, finish: bool) -> bytes:
+        if self.encoding == "br":
+            out = self.compressor.process(data)
+            return out + (self.compressor.finish() if finish else self.compressor.flush())
+        out = self.compressor.compress(data)
+        return out + self.compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
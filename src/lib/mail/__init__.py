@@ -1,6 +1,8 @@
 from .mailer import FastMailWrapper, create_mailer
+from .pool import SMTPConnectionPool
 
 __all__ = [
     "FastMailWrapper",
     "create_mailer",
+    "SMTPConnectionPool",
 ]
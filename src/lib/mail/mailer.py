@@ -1,7 +1,18 @@
-from fastapi_mail import FastMail, ConnectionConfig, MessageSchema, MessageType
+import asyncio
+import time
+from email.utils import formataddr
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig, MessageSchema, MessageType
+from fastapi_mail.fastmail import email_dispatched
+from fastapi_mail.msg import MailMsg
+from jinja2 import Template
 from pydantic import EmailStr
 
 from src.core.config import email_settings
+from src.core.templates import create_template_environment
+
+from .pool import SMTPConnectionPool
 
 
 conf = ConnectionConfig(
@@ -19,8 +30,13 @@ conf = ConnectionConfig(
 
 
 class FastMailWrapper:
-    def __init__(self):
-        self.client = FastMail(conf)
+    def __init__(self, pool: SMTPConnectionPool):
+        self.config = pool.config
+        # Authenticated SMTP connections, reused across messages
+        self.pool = pool
+        # Own template environment, instead of the one fastapi-mail creates (and compiles templates in) on every send:
+        # bytecode cached, compiled templates kept in memory; no autoescape, as in fastapi-mail
+        self.templates = create_template_environment(email_settings.EMAIL_TEMPLATE_FOLDER, "email-templates")
 
     async def send(
         self,
@@ -30,16 +46,84 @@ class FastMailWrapper:
         template_data: dict,
         subtype: MessageType = MessageType.html,
     ) -> None:
+        body = await self.render(template_name, template_data)
+        [error] = await self.send_batch([self.message(subject, recipients, body, subtype)])
+        if error is not None:
+            raise error
+
+    def get_template(self, template_name: str) -> Template:
+        return self.templates.get_template(template_name)
+
+    @staticmethod
+    async def render_template(template: Template, template_data: dict) -> str:
+        """ Rendered in a worker thread, so large or bulk renders do not block the event loop """
+        return await asyncio.to_thread(template.render, **template_data)
+
+    async def render(self, template_name: str, template_data: dict) -> str:
+        return await self.render_template(self.get_template(template_name), template_data)
+
+    @staticmethod
+    def message(
+        subject: str,
+        recipients: list[EmailStr],
+        body: str,
+        subtype: MessageType = MessageType.html,
+    ) -> MessageSchema:
         bcc: list[str] = []  # Use this to send a copy of the email to another email address, for debugging purposes
-        message = MessageSchema(
+        return MessageSchema(
             subject=subject,
             recipients = recipients,
-            template_body=template_data,
+            body=body,
             subtype=subtype,
             bcc=bcc
         )
-        await self.client.send_message(message, template_name=template_name)
+
+    async def send_batch(self, messages: list[MessageSchema]) -> list[Exception | None]:
+        """
+        Send `messages` over one pooled SMTP connection.
+        Returns the outcome of each message: None if sent, else the error. If the connection drops, the batch goes on
+        over a new one (once); failing to connect raises (fastapi_mail.errors.ConnectionErrors).
+        """
+        config = self.config
+        sender = formataddr((config.MAIL_FROM_NAME, config.MAIL_FROM)) if config.MAIL_FROM_NAME else config.MAIL_FROM
+        prepared = [await MailMsg(message)._message(sender) for message in messages]
+        if config.SUPPRESS_SEND:  # for test environ
+            for message in prepared:
+                email_dispatched.send(message)
+            return [None] * len(prepared)
+
+        results: list[Exception | None] = []
+        for reconnect in (False, True):
+            async with self.pool.connection() as smtp:
+                while len(results) < len(prepared):
+                    message = prepared[len(results)]
+                    error = await self._send(smtp, message)
+                    if error is not None and not smtp.is_connected and not reconnect:
+                        break  # connection lost: retry this message on a new one
+                    results.append(error)
+            if len(results) == len(prepared):
+                break
+        return results
+
+    async def _send(self, smtp: aiosmtplib.SMTP, message) -> Exception | None:
+        start = time.perf_counter()
+        try:
+            await smtp.send_message(message)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            self.pool.record_send(time.perf_counter() - start, ok=False)
+            return e
+        self.pool.record_send(time.perf_counter() - start, ok=True)
+        email_dispatched.send(message)
+        return None
+
+    async def close(self) -> None:
+        await self.pool.close()
 
 
 def create_mailer() -> FastMailWrapper:
-    return FastMailWrapper()
+    return FastMailWrapper(SMTPConnectionPool(
+        conf,
+        size=email_settings.EMAIL_POOL_SIZE,
+        max_idle=email_settings.EMAIL_POOL_MAX_IDLE,
+        health_check_after=email_settings.EMAIL_POOL_HEALTH_CHECK_AFTER,
+    ))
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+from fastapi_mail.errors import ConnectionErrors
+
+from src.core.config import logger
+from src.core.metrics import SMTP_SEND_SECONDS
+
+
+class SMTPConnectionPool:
+    """
+    Up to `size` authenticated SMTP connections, kept open and reused across messages (fastapi-mail connects,
+    negotiates STARTTLS and logs in for every send).
+
+    An idle connection is checked with NOOP before reuse when it has been idle for more than `health_check_after`
+    seconds, and closed instead when idle for more than `max_idle` (servers drop idle clients after a few minutes).
+    A connection found disconnected when released is dropped, so the next user gets a fresh one.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int = 2, max_idle: float = 240.0,
+                 health_check_after: float = 15.0):
+        self.config = config
+        self.size = size
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []  # (connection, released at); reused last-in first-out
+        # Counters
+        self.created = 0
+        self.reused = 0
+        self.health_check_failures = 0
+        self.sent = 0
+        self.send_errors = 0
+        self.send_seconds_total = 0.0
+        self.send_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """ Borrow a connection (waits while `size` are in use); raises ConnectionErrors if none can be opened """
+        async with self._semaphore:
+            smtp = await self._acquire()
+            try:
+                yield smtp
+            finally:
+                if smtp.is_connected:
+                    self._idle.append((smtp, time.monotonic()))
+                else:
+                    await self._close(smtp)
+
+    def record_send(self, seconds: float, ok: bool) -> None:
+        if ok:
+            self.sent += 1
+        else:
+            self.send_errors += 1
+        self.send_seconds_total += seconds
+        self.send_seconds_max = max(self.send_seconds_max, seconds)
+        SMTP_SEND_SECONDS.labels("ok" if ok else "error").observe(seconds)
+
+    def stats(self) -> dict[str, int | float]:
+        sends = self.sent + self.send_errors
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "created": self.created,
+            "reused": self.reused,
+            "health_check_failures": self.health_check_failures,
+            "sent": self.sent,
+            "send_errors": self.send_errors,
+            "send_seconds_avg": self.send_seconds_total / sends if sends else 0.0,
+            "send_seconds_max": self.send_seconds_max,
+        }
+
+    async def close(self) -> None:
+        """ Close the idle connections (on app shutdown) """
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._close(smtp) for smtp, _ in idle))
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        now = time.monotonic()
+        while self._idle:
+            smtp, released_at = self._idle.pop()
+            idle_for = now - released_at
+            if idle_for > self.max_idle or not smtp.is_connected:
+                await self._close(smtp)
+                continue
+            if idle_for > self.health_check_after:
+                try:
+                    await smtp.noop()
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    self.health_check_failures += 1
+                    logger.info(f"Pooled SMTP connection dropped, health check failed: {e}")
+                    await self._close(smtp)
+                    continue
+            self.reused += 1
+            return smtp
+        return await self._connect()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        config = self.config
+        smtp = aiosmtplib.SMTP(
+            hostname=config.MAIL_SERVER,
+            timeout=config.TIMEOUT,
+            port=config.MAIL_PORT,
+            use_tls=config.MAIL_SSL_TLS,
+            start_tls=config.MAIL_STARTTLS,
+            validate_certs=config.VALIDATE_CERTS,
+            local_hostname=config.LOCAL_HOSTNAME,
+            cert_bundle=config.CERT_BUNDLE,
+        )
+        try:
+            await smtp.connect()
+            if config.USE_CREDENTIALS:
+                await smtp.login(config.MAIL_USERNAME, config.MAIL_PASSWORD.get_secret_value())
+        except Exception as e:
+            await self._close(smtp)
+            raise ConnectionErrors(
+                f"Exception raised {e}, check your credentials or email service configuration"
+            ) from e
+        self.created += 1
+        return smtp
+
+    @staticmethod
+    async def _close(smtp: aiosmtplib.SMTP) -> None:
+        if not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
@@ -0,0 +1,8 @@
+from .assets import StaticManifest, build_static_assets
+from .files import PrecompressedStaticFiles
+
+__all__ = [
+    "StaticManifest",
+    "build_static_assets",
+    "PrecompressedStaticFiles",
+]
@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path, PurePosixPath
+
+from src.core.config import logger
+from src.lib.compression.encoding import brotli  # optional: None if not installed, then only gzip variants are built
+
+# Text assets worth compressing; fonts, images, etc. already are
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".map", ".svg", ".html", ".txt", ".json", ".xml"}
+# Content-Encoding → suffix of the precompressed variant, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+MANIFEST_NAME = "manifest.json"
+FINGERPRINT_LENGTH = 12
+
+
+class StaticManifest:
+    """
+    Result of a static assets build: for each file (path relative to the static directory, posix separators),
+    its content hash and the precompressed variants available. Maps paths to fingerprinted ones
+    (`css/app.css` → `css/app.<hash>.css`) and back.
+    """
+
+    def __init__(self, files: dict[str, dict] | None = None):
+        self.files = files or {}
+        self._originals = {self._fingerprint(path, entry["hash"]): path for path, entry in self.files.items()}
+
+    @classmethod
+    def load(cls, build_dir: str | Path) -> "StaticManifest":
+        """ Manifest of a previous build, or an empty one (no fingerprints, no variants) if there is none """
+        try:
+            with open(Path(build_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+                return cls(json.load(f)["files"])
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Invalid static assets manifest in {build_dir}, ignored: {e}")
+            return cls()
+
+    def save(self, build_dir: str | Path) -> None:
+        _write_atomic(Path(build_dir) / MANIFEST_NAME, json.dumps({"files": self.files}, indent=1).encode())
+
+    def fingerprinted(self, path: str) -> str | None:
+        entry = self.files.get(path)
+        return self._fingerprint(path, entry["hash"]) if entry else None
+
+    def original(self, fingerprinted: str) -> str | None:
+        return self._originals.get(fingerprinted)
+
+    def encodings(self, path: str) -> list[str]:
+        entry = self.files.get(path)
+        return entry["encodings"] if entry else []
+
+    @staticmethod
+    def _fingerprint(path: str, content_hash: str) -> str:
+        pure = PurePosixPath(path)
+        return str(pure.with_name(f"{pure.stem}.{content_hash[:FINGERPRINT_LENGTH]}{pure.suffix}"))
+
+
+def build_static_assets(
+    source_dir: str | Path,
+    build_dir: str | Path,
+    gzip_level: int = 9,
+    brotli_quality: int = 11,
+) -> StaticManifest:
+    """
+    Hash every file under `source_dir` and write gzip (and brotli, if installed) variants of the compressible ones
+    to `build_dir` (same relative path plus .gz / .br), with the manifest. Incremental: files unchanged since the
+    previous build (same size and mtime, variants present) are skipped. Variants that are not smaller than the
+    original are not kept. Writes are atomic, so concurrent builds (e.g. several workers starting) are safe.
+    """
+    source_dir, build_dir = Path(source_dir), Path(build_dir)
+    previous = StaticManifest.load(build_dir).files
+    files = {}
+    built = 0
+    for source in sorted(p for p in source_dir.rglob("*") if p.is_file()):
+        path = source.relative_to(source_dir).as_posix()
+        stat = source.stat()
+        entry = previous.get(path)
+        if (entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+                and all(variant_path(build_dir, path, e).exists() for e in entry["encodings"])):
+            files[path] = entry
+            continue
+
+        data = source.read_bytes()
+        encodings = []
+        if source.suffix in COMPRESSIBLE_SUFFIXES:
+            variants = {"gzip": gzip.compress(data, compresslevel=gzip_level, mtime=0)}
+            if brotli is not None:
+                variants["br"] = brotli.compress(data, quality=brotli_quality)
+            for encoding in ENCODINGS:
+                if encoding in variants and len(variants[encoding]) < len(data):
+                    _write_atomic(variant_path(build_dir, path, encoding), variants[encoding])
+                    encodings.append(encoding)
+        files[path] = {
+            "hash": hashlib.sha256(data).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "encodings": encodings,
+        }
+        built += 1
+
+    manifest = StaticManifest(files)
+    manifest.save(build_dir)
+    logger.info(f"Static assets: {len(files)} files, {built} (re)built in {build_dir}"
+                + ("" if brotli is not None else " (brotli not installed: gzip only)"))
+    return manifest
+
+
+def variant_path(build_dir: Path, path: str, encoding: str) -> Path:
+    return build_dir / f"{path}{ENCODINGS[encoding]}"
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
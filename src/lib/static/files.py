@@ -0,0 +1,85 @@
+import os
+from mimetypes import guess_type
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from src.lib.compression import negotiate_encoding
+
+from .assets import StaticManifest, build_static_assets, variant_path
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles serving the build of `build_static_assets`:
+    - the precompressed (br / gzip) variant of a file, when the client accepts it (Accept-Encoding);
+    - fingerprinted paths (see `url_path`), cached by browsers for good (`Cache-Control: immutable`), as their
+      content never changes. Plain paths still work, revalidated on each use (ETag / Last-Modified).
+    Until a build is done or loaded, files are served as plain StaticFiles would.
+    """
+
+    def __init__(self, *, directory: str | Path, build_dir: str | Path, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.build_dir = Path(build_dir)
+        self.manifest = StaticManifest()
+
+    def build(self, **options) -> None:
+        self.manifest = build_static_assets(self.directory, self.build_dir, **options)
+
+    def load_manifest(self) -> None:
+        self.manifest = StaticManifest.load(self.build_dir)
+
+    def url_path(self, path: str) -> str:
+        """ Fingerprinted version of `path` (as given to url_for('static', path=...)), or `path` if unknown """
+        relative = path.lstrip("/")
+        fingerprinted = self.manifest.fingerprinted(relative)
+        if fingerprinted is None:
+            return path
+        return path[:len(path) - len(relative)] + fingerprinted
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        original = self.manifest.original(path)
+        if original is not None:
+            path = original
+
+        response = None
+        if scope["method"] in ("GET", "HEAD"):
+            response = await anyio.to_thread.run_sync(self._precompressed_response, path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+            if self.manifest.encodings(path):
+                response.headers["Vary"] = "Accept-Encoding"
+
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE if original is not None else REVALIDATE
+        return response
+
+    def _precompressed_response(self, path: str, scope: Scope) -> Response | None:
+        request_headers = Headers(scope=scope)
+        if "range" in request_headers:
+            return None  # byte ranges refer to the original file
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), self.manifest.encodings(path))
+        if encoding is None:
+            return None
+        variant = variant_path(self.build_dir, path, encoding)
+        try:
+            stat_result = os.stat(variant)
+        except FileNotFoundError:
+            return None
+
+        response = FileResponse(
+            variant,
+            stat_result=stat_result,
+            media_type=guess_type(path)[0] or "text/plain",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
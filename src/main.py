@@ -1,20 +1,31 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import HTTPException
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.responses import RedirectResponse
 
+from src.auth.cache import user_cache
+from src.auth.hasher import password_hasher, PasswordHasherBusyError
 from src.core.config import settings, configure_logging, logger
-from src.core.templates import templates
+from src.core.database import async_engine
+from src.core.schema import upgrade_schema
+from src.core.metrics import MetricsMiddleware, register_stats_collector, unregister_stats_collector
+from src.core.static import static_files, prepare_static_files
+from src.core.templates import render_template, precompile_page_templates
+from src.lib.compression import CompressionMiddleware
 from src.lib.mail import create_mailer
 
 from src.routers.auth import router as login_router
 from src.routers.home import router as home_router
 from src.routers.appointments import router as appointment_router
 from src.routers.reports import router as report_router
-from src.services.email import EmailService, EmailManager
+from src.routers.metrics import router as metrics_router
+from src.services.common.deps import create_endotools_client, create_reference_cache
+from src.services.common.reference_data import warm_up_reference_data
+from src.services.patient.deps import create_patient_cache, create_report_cache, create_patient_prefetcher
+from src.services.email import EmailService, EmailManager, create_outbox_dispatcher
 
 
 @asynccontextmanager
@@ -22,20 +33,78 @@ async def lifespan(app: FastAPI):
     # logging configuration
     configure_logging()
 
+    # Create the missing tables and columns (no migrations); fails the startup if the database cannot be upgraded
+    await upgrade_schema()
+
     # Create the mailer and email-related services / components
     mailer = create_mailer()
     email_service = EmailService(mailer)
-    email_manager = EmailManager(email_service)
+    # Outbox dispatcher: sends the queued emails in background batches
+    outbox_dispatcher = create_outbox_dispatcher(email_service)
+    email_manager = EmailManager(email_service, outbox_dispatcher)
+    # Compile the email templates now; fails the startup if one is missing
+    email_manager.precompile()
     # Store them in app.state for global access (ignore ide warning as starlette will inject state to app)
     app.state.mailer = mailer  # type: ignore
     app.state.email_service = email_service  # type: ignore
     app.state.email_manager = email_manager  # type: ignore
-
-    yield
+    app.state.outbox_dispatcher = outbox_dispatcher  # type: ignore
+    outbox_dispatcher.start()
+
+    # Static assets: precompressed variants and fingerprints (see PrecompressedStaticFiles)
+    await asyncio.to_thread(prepare_static_files)
+
+    # Compile the page templates (or load them from the bytecode cache) before the first request
+    precompile_page_templates()
+
+    # Endotools API client: one pooled (keep-alive) client for the whole app, closed on shutdown
+    async with create_endotools_client() as endotools_client:
+        app.state.endotools_client = endotools_client  # type: ignore
+
+        # Reference data cache; warmed up in background, so a slow Endotools does not delay the startup
+        reference_cache = create_reference_cache()
+        app.state.reference_cache = reference_cache  # type: ignore
+        warm_up = asyncio.create_task(warm_up_reference_data(endotools_client, reference_cache))
+
+        # Per-patient data cache (demographics, appointments, examinations, reports)
+        app.state.patient_cache = create_patient_cache()  # type: ignore
+        # On-disk cache of report PDFs; expired ones are swept from disk periodically
+        report_cache = create_report_cache()
+        report_cache.start(settings.REPORT_CACHE_SWEEP_INTERVAL)
+        app.state.report_cache = report_cache  # type: ignore
+        # Post-login background warm-up of the patient cache
+        patient_prefetcher = create_patient_prefetcher(endotools_client, app.state.patient_cache,
+                                                       app.state.report_cache)
+        app.state.patient_prefetcher = patient_prefetcher  # type: ignore
+
+        # /metrics: expose the components' own counters and state, read at scrape time
+        stats_collector = register_stats_collector(lambda: {
+            "engine": async_engine,
+            "password_hasher": password_hasher,
+            "lru_caches": {"patient": app.state.patient_cache.lru, "user": user_cache.lru},
+            "endotools_client": endotools_client,
+            "patient_prefetcher": patient_prefetcher,
+            "smtp_pool": mailer.pool,
+        })
+
+        yield
+
+        unregister_stats_collector(stats_collector)
+        warm_up.cancel()
+        await patient_prefetcher.close()
+        await report_cache.close()
+        await reference_cache.close()
+
+    await outbox_dispatcher.close()
+    await mailer.close()
+
+    # Close the database connection pool
+    await async_engine.dispose()
+    password_hasher.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
-app.mount("/static", StaticFiles(directory="src/static"), name="static")
+app.mount("/static", static_files, name="static")
 
 app.add_middleware(
     SessionMiddleware,
@@ -46,10 +115,24 @@ app.add_middleware(
     # https_only=True,  # Optional: True if using HTTPS
 )
 
+# Compresses the final responses (pages; not PDFs, nor the precompressed static files)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+# Outermost: per-route request latency, until the (compressed) response is fully sent
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(login_router)
 app.include_router(home_router)
 app.include_router(appointment_router)
 app.include_router(report_router)
+if settings.METRICS_ENABLED and settings.METRICS_TOKEN:
+    app.include_router(metrics_router)
+elif settings.METRICS_ENABLED:
+    logger.warning("METRICS_ENABLED is set but METRICS_TOKEN is not: /metrics is not exposed")
 
 
 @app.exception_handler(HTTPException)
@@ -59,17 +142,27 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         return RedirectResponse(url=exc.headers.get("Location", "/login"), status_code=exc.status_code)
 
     message = exc.detail or "Ha ocurrido un error."
-    return templates.TemplateResponse("error.html", {
+    return await render_template("error.html", {
         "request": request,
         "status_code": exc.status_code,
         "message": message,
     }, status_code=exc.status_code)
 
 
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    # Too many password hashes queued (e.g. login burst): shed load instead of queueing without bound
+    return await render_template("error.html", {
+        "request": request,
+        "status_code": 503,
+        "message": "El servicio está ocupado. Por favor, inténtelo de nuevo en unos segundos.",
+    }, status_code=503, headers={"Retry-After": "5"})
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception on {request.method} {request.url}: {exc}", exc_info=True)
-    return templates.TemplateResponse("error.html", {
+    return await render_template("error.html", {
         "request": request,
         "status_code": 500,
         "message": "Ha ocurrido un error inesperado. Por favor, inténtelo de nuevo más tarde.",
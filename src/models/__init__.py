@@ -1,7 +1,9 @@
 from .user import User
 from .patient import Patient
+from .email import EmailOutbox
 
 __all__ = [
     "User",
     "Patient",
+    "EmailOutbox",
 ]
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, Identity, String, Text, DateTime, JSON, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+from src.models.common.mixins import AuditMixin
+
+
+class EmailOutbox(Base, AuditMixin):
+    """
+    Emails waiting to be sent (or already sent) by the outbox dispatcher (src/services/email/outbox.py).
+    Rows are claimed by pushing `next_attempt_at` forward (a lease), so a message whose worker dies is retried.
+    """
+    __tablename__ = "email_outbox"
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+
+    type: Mapped[str] = mapped_column(String(64), nullable=False)  # EmailType
+    recipients: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    # Template context; cleared once the message is sent or given up (it may hold one-time passwords)
+    context: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # lower is sent first
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                      server_default=func.now())
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_pending", "status", "priority", "next_attempt_at"),
+    )
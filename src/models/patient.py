@@ -15,6 +15,8 @@ class Patient(Base, AuditMixin, SoftDeleteMixin):
 
     mrn: Mapped[str] = mapped_column(String(64), nullable=False)
     mrn_system: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Endotools internal patient id (numeric), saves resolving it from the MRN; backfill: scripts/backfill_patient_external_id.py
+    external_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     date_of_birth: Mapped[date | None]
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
 from src.auth.deps import LoginRequiredDep
-from src.core.templates import templates
+from src.core.templates import render_template
 from src.services.patient.deps import PatientServiceDep
 
 router = APIRouter()
@@ -10,10 +10,10 @@ router = APIRouter()
 
 @router.get("/citas", name="appointments_page", response_class=HTMLResponse)
 async def appointments_page(request: Request, user: LoginRequiredDep, patient_service: PatientServiceDep):
-    patient = user.patient
     appointments_data = []
-    if patient:
-        appointments_data = await patient_service.get_appointments_data(patient.mrn)
+    if user.mrn:
+        appointments_data = await patient_service.get_appointments_data(user.mrn)
 
+    patient = {"full_name": user.name} if user.mrn else None
     context = {"request": request, "user": user, "patient": patient, "appointments": appointments_data}
-    return templates.TemplateResponse("appointments.html", context=context)
+    return await render_template("appointments.html", context)
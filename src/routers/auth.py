@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Request, Response, BackgroundTasks, HTTPException, Depends
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.params import Form
 from starlette.responses import RedirectResponse
 from datetime import date
 
-from src.auth.pwd import verify_password, generate_random_password
+from src.auth.cache import user_cache
+from src.auth.hasher import password_hasher, PasswordHasherBusyError
+from src.auth.pwd import generate_random_password
 from src.auth.session import create_session_cookie, SESSION_COOKIE_NAME, SESSION_MAX_AGE, TMP_SESSION_COOKIE_NAME
 from src.core.config import logger
 from src.core.database import DBSessionDep
-from src.core.templates import templates
+from src.core.templates import render_template
 from src.schemas.registration import RegistrationForm, registration_form_dependency
 
 from src.services import user as user_service
@@ -17,6 +19,7 @@ from src.services import email as email_service
 from src.services.email import EmailManagerDep
 from src.services.insurer.deps import InsurerServiceDep
 from src.services.municipality.deps import MunicipalityServiceDep
+from src.services.patient.deps import PatientPrefetcherDep
 from src.services.province.deps import ProvinceServiceDep
 from src.services.user import get_active_user_by_id
 from src.services.auth.register.deps import RegistrationServiceDep
@@ -27,7 +30,7 @@ router = APIRouter()
 
 
 @router.get("/login", name="login_page", response_class=HTMLResponse)
-def login_page(request: Request, redirect_to: str = None):
+async def login_page(request: Request, redirect_to: str = None):
     session_error_message = request.session.pop("error_message", None)
     session_success_message = request.session.pop("success_message", None)
     context = {"request": request, "redirect_to": redirect_to}
@@ -35,14 +38,20 @@ def login_page(request: Request, redirect_to: str = None):
         context["error_message"] = session_error_message
     if session_success_message:
         context["success_message"] = session_success_message
-    return templates.TemplateResponse("auth/login.html", context=context)
+    return await render_template("auth/login.html", context)
 
 
 @router.post("/login", name="login")
-def login(request: Request, db: DBSessionDep, username: str = Form(...), password: str = Form(...),
-          redirect_to: str = None):
-    user = user_service.get_user_by_username(db, username)
-    if not user or not user.is_active or not verify_password(password, user.hashed_password):
+async def login(request: Request, db: DBSessionDep, patient_prefetcher: PatientPrefetcherDep,
+                username: str = Form(...), password: str = Form(...), redirect_to: str = None):
+    user = await user_service.get_user_by_username(db, username)
+    try:
+        valid_credentials = (user and user.is_active
+                             and await password_hasher.verify_password(password, user.hashed_password))
+    except PasswordHasherBusyError:
+        request.session["error_message"] = "El servicio está ocupado. Por favor, inténtelo de nuevo en unos segundos."
+        return RedirectResponse(url=request.url_for("login_page"), status_code=302)
+    if not valid_credentials:
         request.session["error_message"] = "Credenciales incorrectas."
         return RedirectResponse(url=request.url_for("login_page"), status_code=302)
 
@@ -55,14 +64,20 @@ def login(request: Request, db: DBSessionDep, username: str = Form(...), passwor
         else:
             # If password is expired but still usable → mark OTP as used (if it's an OTP)
             user.otp_password_used = True  # burn the OTP or expired password
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             # Store user ID in session for limited access to the password change page
             set_password_reset_session(request, user.id)
             password_reset_url = request.url_for("password_reset_page")
             return RedirectResponse(password_reset_url, status_code=302)
 
     # Everything OK, proceed to normal login
+    # Warm the caches the next page needs: the user snapshot, and the patient's Endotools data (in background)
+    snapshot = await user_service.get_active_user_snapshot(db, user.id)
+    if snapshot:
+        user_cache.set(snapshot)
+        patient_prefetcher.schedule(snapshot.mrn, snapshot.patient_external_id)
+
     request.session.clear()
     session_cookie, csrf_token = create_session_cookie(user.id)
 
@@ -94,58 +109,60 @@ def logout(request: Request, response: Response):
 
 
 @router.get("/auth/password-recover", name="password_recover_page", response_class=HTMLResponse)
-def password_recover_page(request: Request):
-    return templates.TemplateResponse("auth/password-recover.html", {"request": request})
+async def password_recover_page(request: Request):
+    return await render_template("auth/password-recover.html", {"request": request})
 
 
 @router.post("/auth/password-recover", name="password_recover", response_class=HTMLResponse)
-def password_recover(request: Request, db: DBSessionDep,
-                     background_tasks: BackgroundTasks, email_manager: EmailManagerDep, username: str = Form(...)):
-    user = user_service.get_user_by_username(db, username)
+async def password_recover(request: Request, db: DBSessionDep,
+                           email_manager: EmailManagerDep,
+                           username: str = Form(...)):
+    user = await user_service.get_user_by_username(db, username)
     if user and user.is_active:
         # Ignore if user does not exists or if is not active. Hide it to avoid give much information to potential malicious users...
         new_password = generate_random_password()
         print(new_password)
-        user_service.reset_user_password(db, user, new_password)
         email_list = [user.email]
-        email_service.send_password_recover(user, new_password, background_tasks, email_manager, email_list)
+        # Queued first: the password reset commit stores the new password and its email together
+        await email_service.send_password_recover(user, new_password, db, email_manager, email_list)
+        await user_service.reset_user_password(db, user, new_password)
 
     return RedirectResponse(url=request.url_for("recover_confirmation_page"), status_code=303)
 
 
 @router.get("/auth/recover-confirmation", name="recover_confirmation_page", response_class=HTMLResponse)
-def recover_confirmation_page(request: Request):
-    return templates.TemplateResponse("auth/recover-confirmation.html", {"request": request})
+async def recover_confirmation_page(request: Request):
+    return await render_template("auth/recover-confirmation.html", {"request": request})
 
 
 @router.get("/auth/password-reset", name="password_reset_page", response_class=HTMLResponse)
-def password_reset_page(request: Request, db: DBSessionDep):
+async def password_reset_page(request: Request, db: DBSessionDep):
     session_user_id = get_password_reset_session(request)
     if not session_user_id:
         request.session["error_message"] = "Sesión inválida o caducada."
         return RedirectResponse(url=request.url_for("login_page"), status_code=302)
 
-    user = get_active_user_by_id(db, session_user_id)
+    user = await get_active_user_by_id(db, session_user_id)
     if not user or not user.is_password_expired:
         request.session["error_message"] = "Acceso no autorizado."
         return RedirectResponse(url=request.url_for("login_page"), status_code=302)
     set_password_reset_session(request, user.id)  # Reassign temporary session for POST
 
-    return templates.TemplateResponse("auth/password-reset.html", {"request": request})
+    return await render_template("auth/password-reset.html", {"request": request})
 
 
 @router.post("/auth/password-reset", name="password_reset", response_class=HTMLResponse)
-def password_reset(request: Request, db: DBSessionDep, new_password: str = Form(...)):
+async def password_reset(request: Request, db: DBSessionDep, new_password: str = Form(...)):
     session_user_id = get_password_reset_session(request)
     if not session_user_id:
         request.session["error_message"] = "Sesión inválida o caducada."
         return RedirectResponse(url=request.url_for("login_page"), status_code=302)
 
-    user = get_active_user_by_id(db, session_user_id)
+    user = await get_active_user_by_id(db, session_user_id)
     if not user or not user.is_password_expired:
         request.session["error_message"] = "Acceso no autorizado."
         return RedirectResponse(url=request.url_for("login_page"), status_code=302)
-    user_service.update_user_password(db, user, new_password)
+    await user_service.update_user_password(db, user, new_password)
 
     # request.session["success_message"] = "Contraseña actualizada correctamente. Inicie sesión."
     return RedirectResponse(url=request.url_for("login_page"), status_code=302)
@@ -169,7 +186,7 @@ async def registration_form(
     context = {"request": request, "insurers": insurers, "municipalities": municipalities, "provinces": provinces}
     if session_error_message:
         context["error_message"] = session_error_message
-    return templates.TemplateResponse("auth/register.html", context=context)
+    return await render_template("auth/register.html", context)
 
 
 @router.post("/auth/register", name="registration_submit", response_class=HTMLResponse)
@@ -204,6 +221,12 @@ async def registration_submit(
         request.session["error_message"] = "Error al crear el paciente. Por favor, inténtelo de nuevo."
         return RedirectResponse(url=request.url_for("registration_form"), status_code=302)
 
+    except PasswordHasherBusyError:
+        # Too many password hashes queued → back to form to retry
+        logger.warning("Registration failed - password hasher busy")
+        request.session["error_message"] = "El servicio está ocupado. Por favor, inténtelo de nuevo en unos segundos."
+        return RedirectResponse(url=request.url_for("registration_form"), status_code=302)
+
     except Exception as e:
         # Unexpected error → back to form to retry
         logger.error(f"Registration failed - unexpected error: {e}")
@@ -3,7 +3,7 @@ from fastapi.responses import HTMLResponse
 from starlette.responses import RedirectResponse
 
 from src.auth.deps import LoginRequiredDep
-from src.core.templates import templates
+from src.core.templates import render_template
 from src.services.patient.deps import PatientServiceDep
 
 router = APIRouter()
@@ -16,11 +16,10 @@ async def redirect_home():
 
 @router.get("/home", name="home_page", response_class=HTMLResponse)
 async def home_page(request: Request, user: LoginRequiredDep, patient_service: PatientServiceDep):
-    patient = user.patient
     patient_data = {}
 
-    if patient:
-        patient_data = await patient_service.get_patient_data(patient.mrn)
+    if user.mrn:
+        patient_data = await patient_service.get_patient_data(user.mrn)
 
     context = {"request": request, "user": user, "patient": patient_data}
-    return templates.TemplateResponse("home.html", context=context)
+    return await render_template("home.html", context)
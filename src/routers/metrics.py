@@ -0,0 +1,17 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request
+
+from src.core.config import settings
+from src.core.metrics import metrics_response
+
+router = APIRouter()
+
+
+@router.get("/metrics", name="metrics", include_in_schema=False)
+def metrics(request: Request):
+    # Only included when METRICS_TOKEN is set (see main.py). Compared as bytes: compare_digest rejects non-ASCII str
+    authorization = request.headers.get("authorization", "").encode()
+    if not secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="No autorizado.")
+    return metrics_response()
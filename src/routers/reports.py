@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
 
 from src.auth.deps import LoginRequiredDep
-from src.core.templates import templates
+from src.core.templates import stream_template
 from src.services.patient.deps import PatientServiceDep
 
 router = APIRouter()
@@ -10,27 +11,32 @@ router = APIRouter()
 
 @router.get("/informes", name="reports_page", response_class=HTMLResponse)
 async def reports_page(request: Request, user: LoginRequiredDep, patient_service: PatientServiceDep):
-    patient = user.patient
     examinations_data = []
-    if patient:
-        examinations_data = await patient_service.get_examinations_data(patient.mrn)
+    if user.mrn:
+        # Not awaited here: rows are rendered as they arrive, after the page shell has been sent
+        examinations_data = patient_service.iter_examinations_data(user.mrn, user.patient_external_id)
 
-    print(examinations_data)
+    patient = {"full_name": user.name} if user.mrn else None
     context = {"request": request, "user": user, "patient": patient, "examinations": examinations_data}
-    return templates.TemplateResponse("reports.html", context=context)
+    return stream_template("reports.html", context=context)
 
 
 @router.get("/examinations/{examination_id}/report")
 async def download_report(examination_id: int, _user: LoginRequiredDep, patient_service: PatientServiceDep):
-
-    stream = await patient_service.get_exam_last_report(examination_id)
-
     # it will leave the frontend decide if downalod or open in new tab.
     # if want to force download, use "Content-Disposition": "attachment; filename=report.pdf" instead
+    headers = {"Content-Disposition": "inline; filename=informe.pdf"}
+
+    # Cached on disk → sent as a file (zero-copy sendfile, when the server supports it)
+    cached_report = await patient_service.checkout_cached_exam_report(examination_id)
+    if cached_report:
+        return FileResponse(cached_report, media_type="application/pdf", headers=headers,
+                            background=BackgroundTask(patient_service.release_cached_exam_report, cached_report))
+
+    # Not cached → proxy from Endotools, filling the cache while streaming
+    stream = await patient_service.get_exam_last_report(examination_id)
     return StreamingResponse(
         stream,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": "inline; filename=informe.pdf"
-        },
+        headers=headers,
     )
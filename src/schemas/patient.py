@@ -1,10 +1,13 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 from datetime import date, time
 
 
 # schemas related to the patient domain
+# View models, built by src/mappers/endotools from already validated DTOs: plain slotted dataclasses, so mapping
+# does not validate the data a second time and each row stays small (no per-instance __dict__).
 
-class PatientSummary(BaseModel):
+@dataclass(slots=True)
+class PatientSummary:
     mrn: str
     full_name: str
     birth_date: date | None
@@ -12,14 +15,16 @@ class PatientSummary(BaseModel):
     patient_id: int
 
 
-class Appointment(BaseModel):
+@dataclass(slots=True)
+class Appointment:
     appointment_id: int
     date: date
     time: time
     procedure: str | None
 
 
-class Examination(BaseModel):
+@dataclass(slots=True)
+class Examination:
     exam_id: int
     date: date
     service: str | None
@@ -28,7 +33,8 @@ class Examination(BaseModel):
     is_report_available: bool | None = False
 
 
-class Report(BaseModel):
+@dataclass(slots=True)
+class Report:
     report_id: str
     date: date
     procedure: str | None
@@ -5,10 +5,12 @@ from fastapi import Depends
 from src.core.database import DBSessionDep
 from src.services.common.deps import EndotoolsClientDep
 from src.services.auth.register.service import RegistrationService
+from src.services.patient.deps import PatientCacheDep
 
 
-def get_registration_service(db: DBSessionDep, client: EndotoolsClientDep) -> RegistrationService:
-    return RegistrationService(db, client)
+def get_registration_service(db: DBSessionDep, client: EndotoolsClientDep,
+                             patient_cache: PatientCacheDep) -> RegistrationService:
+    return RegistrationService(db, client, patient_cache)
 
 
 RegistrationServiceDep: TypeAlias = Annotated[RegistrationService, Depends(get_registration_service)]
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import logger
 from src.infrastructure.external.endotools.client import EndotoolsAPIClient
@@ -7,12 +7,14 @@ from src.mappers.endotools.patient_mapper import map_registration_to_create_pati
 from src.schemas.registration import RegistrationForm
 from src.services import user as user_service
 from src.services.common.exceptions import UserAlreadyExistsError, UserPatientDataError
+from src.services.patient.cache import PatientDataCache
 
 
 class RegistrationService:
-    def __init__(self, db: Session, client: EndotoolsAPIClient):
+    def __init__(self, db: AsyncSession, client: EndotoolsAPIClient, patient_cache: PatientDataCache):
         self.db = db
         self.client = client
+        self.patient_cache = patient_cache
 
     async def create_patient(self, registration_form: RegistrationForm) -> str:
         """
@@ -32,7 +34,7 @@ class RegistrationService:
         id_document_number = registration_form.id_document_number
 
         # Check if user already exists in local database
-        existing_user = user_service.get_user_by_username(self.db, str(id_document_number))
+        existing_user = await user_service.get_user_by_username(self.db, str(id_document_number))
         if existing_user:
             logger.warning(f"Attempted to register existing user: {id_document_number}")
             raise UserAlreadyExistsError("El usuario ya existe.")
@@ -76,7 +78,7 @@ class RegistrationService:
         
         # Create User and Patient in local database
         try:
-            user, patient = user_service.create_user_with_patient(
+            user, patient = await user_service.create_user_with_patient(
                 db=self.db,
                 username=id_document_number,
                 name=full_name,
@@ -85,12 +87,16 @@ class RegistrationService:
                 password=password,
                 mrn=demographics.idunico,
                 mrn_system="endotools",
-                date_of_birth=demographics.fechaNacimiento
+                date_of_birth=demographics.fechaNacimiento,
+                external_id=demographics.id
             )
             logger.info(f"User and Patient created in database: user_id={user.id}, patient_id={patient.id}")
         except Exception as e:
             logger.error(f"Failed to create User and Patient in database: {e}")
             raise
-        
+
+        # Drop anything cached for this patient before registration (e.g. a cached "not found")
+        self.patient_cache.invalidate_patient(mrn=demographics.idunico, patient_id=demographics.id)
+
         logger.info(f"Patient registration completed successfully with ID: {response.id}")
         return response.id
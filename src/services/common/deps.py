@@ -1,18 +1,55 @@
 from typing import Annotated, TypeAlias
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from src.core.config import settings
 from src.infrastructure.external.endotools.client import EndotoolsAPIClient
+from src.infrastructure.external.endotools.resilience import RetryPolicy
+from src.lib.cache import StaleWhileRevalidateCache
 
 
-def get_endotools_client() -> EndotoolsAPIClient:
-    """Create and configure Endotools API client."""
+def create_endotools_client() -> EndotoolsAPIClient:
+    """
+    Create and configure Endotools API client.
+    Called once from the app lifespan, which also opens and closes it (async context manager).
+    """
     return EndotoolsAPIClient(
         base_url=settings.ENDOTOOLS_BASE_URL,
         auth_key=settings.ENDOTOOLS_KEY,
-        timeout=settings.ENDOTOOLS_TIMEOUT
+        timeout=settings.ENDOTOOLS_TIMEOUT,
+        max_connections=settings.ENDOTOOLS_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.ENDOTOOLS_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.ENDOTOOLS_KEEPALIVE_EXPIRY,
+        connect_timeout=settings.ENDOTOOLS_CONNECT_TIMEOUT,
+        retry_policy=RetryPolicy(
+            max_retries=settings.ENDOTOOLS_MAX_RETRIES,
+            backoff_base=settings.ENDOTOOLS_BACKOFF_BASE,
+            backoff_max=settings.ENDOTOOLS_BACKOFF_MAX,
+        ),
+        breaker_failure_threshold=settings.ENDOTOOLS_BREAKER_FAILURE_THRESHOLD,
+        breaker_reset_timeout=settings.ENDOTOOLS_BREAKER_RESET_TIMEOUT,
     )
 
 
+def get_endotools_client(request: Request) -> EndotoolsAPIClient:
+    """ Return the app-lifetime (pooled) Endotools client from the app's shared state """
+    return request.app.state.endotools_client
+
+
 EndotoolsClientDep: TypeAlias = Annotated[EndotoolsAPIClient, Depends(get_endotools_client)]
+
+
+def create_reference_cache() -> StaleWhileRevalidateCache:
+    """ Cache for Endotools reference lists (insurers, municipalities, provinces). Created once, from the app lifespan """
+    return StaleWhileRevalidateCache(
+        ttl=settings.REFERENCE_CACHE_TTL,
+        max_stale=settings.REFERENCE_CACHE_MAX_STALE,
+    )
+
+
+def get_reference_cache(request: Request) -> StaleWhileRevalidateCache:
+    """ Return the app-lifetime reference data cache from the app's shared state """
+    return request.app.state.reference_cache
+
+
+ReferenceCacheDep: TypeAlias = Annotated[StaleWhileRevalidateCache, Depends(get_reference_cache)]
@@ -0,0 +1,22 @@
+import asyncio
+
+from src.core.config import logger
+from src.infrastructure.external.endotools.client import EndotoolsAPIClient
+from src.lib.cache import StaleWhileRevalidateCache
+from src.services.insurer.service import InsurerService
+from src.services.municipality.service import MunicipalityService
+from src.services.province.service import ProvinceService
+
+
+async def warm_up_reference_data(client: EndotoolsAPIClient, cache: StaleWhileRevalidateCache) -> None:
+    """
+    Load the reference lists used by the registration form into the cache.
+    Services already log and swallow Endotools errors, so a failed warm-up only means the first page view loads them.
+    """
+    insurers, municipalities, provinces = await asyncio.gather(
+        InsurerService(client, cache).get_insurers(),
+        MunicipalityService(client, cache).get_municipalities(),
+        ProvinceService(client, cache).get_provinces(),
+    )
+    logger.info(f"Reference data warm-up: insurers={insurers is not None}, "
+                f"municipalities={municipalities is not None}, provinces={provinces is not None}")
@@ -1,5 +1,6 @@
 from .service import EmailService
 from .manager import EmailManager, EmailManagerDep, get_email_manager, EmailData
+from .outbox import EmailOutboxDispatcher, create_outbox_dispatcher
 from .config import EmailType
 from .handlers.auth import send_new_user, send_password_reset, send_password_recover
 
@@ -9,6 +10,8 @@ __all__ = [
     "EmailManagerDep",
     "EmailData",
     "get_email_manager",
+    "EmailOutboxDispatcher",
+    "create_outbox_dispatcher",
     "EmailType",
     "send_new_user",
     "send_password_reset",
@@ -2,10 +2,16 @@ from dataclasses import dataclass
 from enum import Enum
 
 
+# Outbox priorities: lower ones are sent first
+PRIORITY_HIGH = 0  # the user is waiting for it (e.g. a one-time password)
+PRIORITY_NORMAL = 10
+
+
 @dataclass(frozen=True)
 class EmailConfig:
     subject: str
     template: str
+    priority: int = PRIORITY_NORMAL
 
 
 class EmailType(str, Enum):
@@ -21,11 +27,13 @@ EMAIL_CONFIGS = {
     ),
     EmailType.ADMIN_PASSWORD_RESET: EmailConfig(
         subject="Notificación de Cambio de Contraseña",
-        template="password-reset.html"
+        template="password-reset.html",
+        priority=PRIORITY_HIGH
     ),
     EmailType.USER_PASSWORD_RECOVER: EmailConfig(
         subject="Notificación de Recuperación de Contraseña",
-        template="password-recover.html"
+        template="password-recover.html",
+        priority=PRIORITY_HIGH
     )
 }
 
@@ -1,14 +1,15 @@
 from typing import List
 
-from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import User
 from src.services.email import EmailManager, EmailType
 
+# The emails are queued in the caller's `db` session: they are stored (and sent) once the caller commits it.
 
-def send_new_user(user: User, otp_password: str,
-                  background_tasks: BackgroundTasks, email_manager: EmailManager,
-                  email_list: List[str] = None):
+async def send_new_user(user: User, otp_password: str,
+                        db: AsyncSession, email_manager: EmailManager,
+                        email_list: List[str] = None):
     if not email_list:
         # empty or none, do nothing
         return
@@ -19,17 +20,12 @@ def send_new_user(user: User, otp_password: str,
         "otp_password": otp_password,
     }
 
-    background_tasks.add_task(
-        email_manager.send_email,
-        EmailType.WELCOME,
-        email_list,
-        email_context
-    )
+    await email_manager.enqueue_email(db, EmailType.WELCOME, email_list, email_context)
 
 
-def send_password_reset(user: User, otp_password: str,
-                        background_tasks: BackgroundTasks, email_manager: EmailManager,
-                        email_list: List[str] = None):
+async def send_password_reset(user: User, otp_password: str,
+                              db: AsyncSession, email_manager: EmailManager,
+                              email_list: List[str] = None):
     if not email_list:
         # empty or none, do nothing
         return
@@ -40,17 +36,12 @@ def send_password_reset(user: User, otp_password: str,
         "otp_password": otp_password,
     }
 
-    background_tasks.add_task(
-        email_manager.send_email,
-        EmailType.ADMIN_PASSWORD_RESET,
-        email_list,
-        email_context
-    )
+    await email_manager.enqueue_email(db, EmailType.ADMIN_PASSWORD_RESET, email_list, email_context)
 
 
-def send_password_recover(user: User, otp_password: str,
-                          background_tasks: BackgroundTasks, email_manager: EmailManager,
-                          email_list: List[str] = None):
+async def send_password_recover(user: User, otp_password: str,
+                                db: AsyncSession, email_manager: EmailManager,
+                                email_list: List[str] = None):
     if not email_list:
         # empty or none, do nothing
         return
@@ -61,9 +52,4 @@ def send_password_recover(user: User, otp_password: str,
         "otp_password": otp_password,
     }
 
-    background_tasks.add_task(
-        email_manager.send_email,
-        EmailType.USER_PASSWORD_RECOVER,
-        email_list,
-        email_context
-    )
+    await email_manager.enqueue_email(db, EmailType.USER_PASSWORD_RECOVER, email_list, email_context)
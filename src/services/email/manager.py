@@ -1,9 +1,16 @@
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, Annotated, TypeAlias, List
 
 from fastapi import Request, Depends
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.metrics import EMAILS
+from src.models import EmailOutbox
 
 from .config import EmailType, get_email_config
+from .outbox import EmailOutboxDispatcher
 from .service import EmailService
 
 
@@ -15,8 +22,36 @@ class EmailData:
 
 
 class EmailManager:
-    def __init__(self, email_service: EmailService):
+    def __init__(self, email_service: EmailService, outbox: EmailOutboxDispatcher | None = None):
         self.email_service = email_service
+        self.outbox = outbox
+
+    def precompile(self) -> None:
+        """ Compile and validate the template of every email type (see EmailService.precompile) """
+        self.email_service.precompile()
+
+    async def enqueue_email(
+        self,
+        db: AsyncSession,
+        email_type: EmailType,
+        recipients: list[str],
+        context: dict[str, Any]
+    ) -> None:
+        """
+        Add the email to the outbox table in the caller's session, to be sent by the outbox dispatcher. Not committed
+        here: the caller's commit stores it atomically with the change it notifies (e.g. a password reset), and
+        wakes the dispatcher.
+        """
+        config = get_email_config(email_type)
+        db.add(EmailOutbox(
+            type=email_type.value,
+            recipients=recipients,
+            context=context,
+            priority=config.priority,
+            next_attempt_at=datetime.now(timezone.utc),
+        ))
+        if self.outbox is not None:
+            event.listen(db.sync_session, "after_commit", lambda _session: self.outbox.wake(), once=True)
 
     async def send_email(
         self,
@@ -25,11 +60,12 @@ class EmailManager:
         context: dict[str, Any]
     ) -> None:
         config = get_email_config(email_type)
-        await self.email_service.send_email(
+        sent = await self.email_service.send_email(
             config=config,
             recipients=recipients,
             context=context
         )
+        EMAILS.labels(email_type.value, "sent" if sent else "failed").inc()
 
 
 def get_email_manager(request: Request) -> EmailManager:
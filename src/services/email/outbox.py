@@ -0,0 +1,163 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import email_settings, logger
+from src.core.database import AsyncSessionLocal
+from src.core.metrics import EMAILS
+from src.models import EmailOutbox
+
+from .config import EmailType, get_email_config
+from .service import EmailService
+
+
+class EmailOutboxDispatcher:
+    """
+    Background worker sending the emails queued in the outbox table (see EmailManager.enqueue_email).
+
+    Each batch takes the due messages by priority, claims them (FOR UPDATE SKIP LOCKED, so several workers or app
+    instances can run it side by side) by pushing `next_attempt_at` forward `lease` seconds, then sends them over one
+    SMTP connection. Failed messages are retried with exponential backoff, and given up after `max_attempts`;
+    a message whose worker dies while sending it becomes due again when its lease expires.
+    """
+
+    def __init__(
+        self,
+        email_service: EmailService,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 50,
+        poll_interval: float = 5.0,
+        lease: int = 300,
+        max_attempts: int = 8,
+        retry_delay: int = 30,
+        retry_max_delay: int = 3600,
+    ):
+        self.email_service = email_service
+        self.mailer = email_service.mailer
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """ Stop the worker (on app shutdown); messages being sent are retried after their lease """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def wake(self) -> None:
+        """ New messages queued: dispatch now instead of at the next poll """
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                count = await self.dispatch_batch()
+            except Exception as e:
+                logger.error(f"Email outbox dispatch failed: {e}")
+                count = 0
+            if count < self.batch_size:  # drained: wait for new messages
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def dispatch_batch(self) -> int:
+        """ Send one batch of due messages; returns how many were claimed """
+        rows = await self._claim()
+        if not rows:
+            return 0
+
+        messages, errors = [], {}
+        for row in rows:
+            try:
+                email_type = EmailType(row.type)
+                config = get_email_config(email_type)
+                body = await self.email_service.render(email_type, row.context or {})
+                messages.append((row, self.mailer.message(config.subject, row.recipients, body)))
+            except Exception as e:
+                errors[row.id] = e
+
+        if messages:
+            try:
+                results = await self.mailer.send_batch([message for _, message in messages])
+            except Exception as e:  # could not connect: the whole batch is retried
+                results = [e] * len(messages)
+            errors.update((row.id, error) for (row, _), error in zip(messages, results) if error is not None)
+
+        await self._record(rows, errors)
+        return len(rows)
+
+    async def _claim(self) -> list[EmailOutbox]:
+        now = datetime.now(timezone.utc)
+        stmt = (
+            select(EmailOutbox)
+            .where(EmailOutbox.status == EmailOutbox.PENDING, EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.priority, EmailOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as db:
+            rows = list(await db.scalars(stmt))
+            for row in rows:
+                row.attempts += 1
+                row.next_attempt_at = now + timedelta(seconds=self.lease)
+            await db.commit()
+        return rows
+
+    async def _record(self, rows: list[EmailOutbox], errors: dict[int, Exception]) -> None:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            for row in rows:
+                row = await db.merge(row, load=False)
+                error = errors.get(row.id)
+                if error is None:
+                    row.status = EmailOutbox.SENT
+                    row.sent_at = now
+                    row.context = None
+                    row.last_error = None
+                    self.sent += 1
+                    EMAILS.labels(row.type, "sent").inc()
+                elif row.attempts >= self.max_attempts:
+                    row.status = EmailOutbox.FAILED
+                    row.context = None
+                    row.last_error = str(error)
+                    self.failed += 1
+                    EMAILS.labels(row.type, "failed").inc()
+                    logger.error(f"Email {row.id} ({row.type}) given up after {row.attempts} attempts: {error}")
+                else:
+                    delay = min(self.retry_max_delay, self.retry_delay * 2 ** (row.attempts - 1))
+                    row.next_attempt_at = now + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+                    row.last_error = str(error)
+                    self.retried += 1
+                    EMAILS.labels(row.type, "retry").inc()
+                    logger.warning(f"Email {row.id} ({row.type}) failed, retry in {delay}s: {error}")
+            await db.commit()
+
+
+def create_outbox_dispatcher(email_service: EmailService) -> EmailOutboxDispatcher:
+    return EmailOutboxDispatcher(
+        email_service,
+        AsyncSessionLocal,
+        batch_size=email_settings.EMAIL_OUTBOX_BATCH_SIZE,
+        poll_interval=email_settings.EMAIL_OUTBOX_POLL_INTERVAL,
+        lease=email_settings.EMAIL_OUTBOX_LEASE,
+        max_attempts=email_settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        retry_delay=email_settings.EMAIL_OUTBOX_RETRY_DELAY,
+        retry_max_delay=email_settings.EMAIL_OUTBOX_RETRY_MAX_DELAY,
+    )
@@ -1,16 +1,40 @@
 from typing import Any
 
 from fastapi_mail import MessageType
+from jinja2 import Template, TemplateError
+
+from src.core.config import logger
 from src.lib.mail import FastMailWrapper
 
-from .config import EmailConfig
+from .config import EmailConfig, EmailType, get_email_config
 
 
 class EmailService:
     def __init__(self, mailer: FastMailWrapper):
         self.mailer = mailer
+        self._templates: dict[EmailType, Template] = {}  # compiled template of each email type
+
+    def precompile(self) -> None:
+        """
+        Compile the template of every EmailType (called from the app lifespan), so no send pays for it,
+        and a missing or invalid template stops the startup instead of failing the emails later.
+        """
+        for email_type in EmailType:
+            config = get_email_config(email_type)
+            try:
+                self._templates[email_type] = self.mailer.get_template(config.template)
+            except TemplateError as e:
+                raise ValueError(f"Invalid email template '{config.template}' for {email_type.value}: {e}") from e
+        logger.info(f"Precompiled {len(self._templates)} email templates")
+
+    async def render(self, email_type: EmailType, context: dict[str, Any]) -> str:
+        template = self._templates.get(email_type)
+        if template is None:
+            template = self._templates[email_type] = self.mailer.get_template(get_email_config(email_type).template)
+        return await self.mailer.render_template(template, context)
 
-    async def send_email(self, config: EmailConfig, recipients: list[str], context: dict[str, Any]) -> None:
+    async def send_email(self, config: EmailConfig, recipients: list[str], context: dict[str, Any]) -> bool:
+        """ Send now (not through the outbox); returns whether it was sent, failures are only logged """
         try:
             await self.mailer.send(
                 subject=config.subject,
@@ -20,5 +44,6 @@ class EmailService:
                 subtype=MessageType.html
             )
         except Exception as e:
-            # Log the error here!
-            print(f"Failed to send email '{config.subject}': {e}")
+            logger.error(f"Failed to send email '{config.subject}': {e}")
+            return False
+        return True
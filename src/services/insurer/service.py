@@ -1,17 +1,21 @@
 from src.core.config import logger
 from src.infrastructure.external.endotools.client import EndotoolsAPIClient
 from src.infrastructure.external.endotools.exceptions import ExternalAPINotFoundError, ExternalAPIError
+from src.lib.cache import StaleWhileRevalidateCache
 from src.mappers.endotools.data_mapper import to_insurer
 
 
 class InsurerService:
-    def __init__(self, client: EndotoolsAPIClient):
+    CACHE_KEY = "insurers"
+
+    def __init__(self, client: EndotoolsAPIClient, cache: StaleWhileRevalidateCache):
         self.client = client
+        self.cache = cache
 
     async def get_insurers(self):
 
         try:
-            data = await self.client.get_insurers()
+            data = await self.cache.get(self.CACHE_KEY, self.client.get_insurers)
             insurers = [to_insurer(insurer_dto) for insurer_dto in data]
         except ExternalAPINotFoundError:
             logger.warning(f"Insurers not found")
@@ -2,12 +2,12 @@ from typing import Annotated, TypeAlias
 
 from fastapi import Depends
 
-from src.services.common.deps import EndotoolsClientDep
+from src.services.common.deps import EndotoolsClientDep, ReferenceCacheDep
 from src.services.municipality.service import MunicipalityService
 
 
-def get_municipality_service(client: EndotoolsClientDep) -> MunicipalityService:
-    return MunicipalityService(client)
+def get_municipality_service(client: EndotoolsClientDep, cache: ReferenceCacheDep) -> MunicipalityService:
+    return MunicipalityService(client, cache)
 
 
 MunicipalityServiceDep: TypeAlias = Annotated[MunicipalityService, Depends(get_municipality_service)]
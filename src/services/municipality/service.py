@@ -1,17 +1,21 @@
 from src.core.config import logger
 from src.infrastructure.external.endotools.client import EndotoolsAPIClient
 from src.infrastructure.external.endotools.exceptions import ExternalAPIError, ExternalAPINotFoundError
+from src.lib.cache import StaleWhileRevalidateCache
 from src.mappers.endotools.data_mapper import to_municipality
 
 
 class MunicipalityService:
-    def __init__(self, client: EndotoolsAPIClient):
+    CACHE_KEY = "municipalities"
+
+    def __init__(self, client: EndotoolsAPIClient, cache: StaleWhileRevalidateCache):
         self.client = client
+        self.cache = cache
 
     async def get_municipalities(self):
 
         try:
-            data = await self.client.get_municipalities()
+            data = await self.cache.get(self.CACHE_KEY, self.client.get_municipalities)
             municipalities = [to_municipality(municipality_dto) for municipality_dto in data]
         except ExternalAPINotFoundError:
             logger.warning(f"Municipalities not found")
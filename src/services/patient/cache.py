@@ -0,0 +1,64 @@
+from collections.abc import Awaitable, Callable, Hashable
+from enum import Enum
+from typing import Any
+
+from src.infrastructure.external.endotools.exceptions import ExternalAPINotFoundError
+from src.lib.cache import LRUCache, MISSING
+
+
+class PatientResource(str, Enum):
+    DEMOGRAPHICS = "demographics"  # keyed by MRN
+    APPOINTMENTS = "appointments"  # keyed by MRN
+    EXAMINATIONS = "examinations"  # keyed by Endotools patient id
+    REPORTS = "reports"  # keyed by examination id
+
+
+class _NotFound:
+    """ Negative cache entry: the upstream answered 404 / empty for this key """
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class PatientDataCache:
+    """
+    App-lifetime cache of per-patient Endotools data (DTOs), on top of a memory-bounded LRU.
+    Each resource has its own TTL; ExternalAPINotFoundError is cached for a short `negative_ttl` window.
+    Call `invalidate_patient` when a patient's data is known to have changed (e.g. after registration).
+    """
+
+    def __init__(self, lru: LRUCache, ttls: dict[PatientResource, float], negative_ttl: float):
+        self._lru = lru
+        self._ttls = ttls
+        self._negative_ttl = negative_ttl
+
+    @property
+    def lru(self) -> LRUCache:
+        return self._lru
+
+    async def get_or_load(self, resource: PatientResource, key: Hashable,
+                          loader: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._lru.get((resource, key))
+        if isinstance(cached, _NotFound):
+            raise ExternalAPINotFoundError(cached.message)
+        if cached is not MISSING:
+            return cached
+
+        try:
+            value = await loader()
+        except ExternalAPINotFoundError as e:
+            self._lru.set((resource, key), _NotFound(str(e)), ttl=self._negative_ttl)
+            raise
+        self._lru.set((resource, key), value, ttl=self._ttls[resource])
+        return value
+
+    def invalidate_patient(self, mrn: str | None = None, patient_id: int | None = None) -> None:
+        """ Drop everything cached for a patient, including the reports of its cached examinations """
+        if mrn is not None:
+            self._lru.delete_many([(PatientResource.DEMOGRAPHICS, mrn), (PatientResource.APPOINTMENTS, mrn)])
+        if patient_id is not None:
+            examinations = self._lru.get((PatientResource.EXAMINATIONS, patient_id))
+            if isinstance(examinations, list):
+                self._lru.delete_many((PatientResource.REPORTS, exam.id) for exam in examinations)
+            self._lru.delete((PatientResource.EXAMINATIONS, patient_id))
@@ -1,13 +1,86 @@
 from typing import TypeAlias, Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
+from src.core.config import settings
+from src.infrastructure.external.endotools.client import EndotoolsAPIClient
+from src.lib.cache import LRUCache, FileCache, RequestMemo
 from src.services.common.deps import EndotoolsClientDep
+from src.services.patient.cache import PatientDataCache, PatientResource
+from src.services.patient.prefetch import PatientPrefetcher
 from src.services.patient.service import PatientService
 
 
-def get_patient_service(client: EndotoolsClientDep) -> PatientService:
-    return PatientService(client)
+def create_patient_cache() -> PatientDataCache:
+    """ Per-patient Endotools data cache. Created once, from the app lifespan """
+    return PatientDataCache(
+        lru=LRUCache(max_bytes=settings.PATIENT_CACHE_MAX_BYTES, max_entries=settings.PATIENT_CACHE_MAX_ENTRIES),
+        ttls={
+            PatientResource.DEMOGRAPHICS: settings.PATIENT_CACHE_TTL_DEMOGRAPHICS,
+            PatientResource.APPOINTMENTS: settings.PATIENT_CACHE_TTL_APPOINTMENTS,
+            PatientResource.EXAMINATIONS: settings.PATIENT_CACHE_TTL_EXAMINATIONS,
+            PatientResource.REPORTS: settings.PATIENT_CACHE_TTL_REPORTS,
+        },
+        negative_ttl=settings.PATIENT_CACHE_NEGATIVE_TTL,
+    )
+
+
+def get_patient_cache(request: Request) -> PatientDataCache:
+    """ Return the app-lifetime patient data cache from the app's shared state """
+    return request.app.state.patient_cache
+
+
+PatientCacheDep: TypeAlias = Annotated[PatientDataCache, Depends(get_patient_cache)]
+
+
+def create_report_cache() -> FileCache:
+    """ On-disk cache of examination report PDFs. Created once, from the app lifespan """
+    return FileCache(
+        directory=settings.REPORT_CACHE_DIR,
+        max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+        ttl=settings.REPORT_CACHE_TTL,
+    )
+
+
+def get_report_cache(request: Request) -> FileCache:
+    """ Return the app-lifetime report disk cache from the app's shared state """
+    return request.app.state.report_cache
+
+
+ReportCacheDep: TypeAlias = Annotated[FileCache, Depends(get_report_cache)]
+
+
+def get_request_memo(request: Request) -> RequestMemo:
+    """ Return the memo of Endotools reads for the current request, created on first use """
+    memo = getattr(request.state, "endotools_memo", None)
+    if memo is None:
+        memo = RequestMemo()
+        request.state.endotools_memo = memo
+    return memo
+
+
+RequestMemoDep: TypeAlias = Annotated[RequestMemo, Depends(get_request_memo)]
+
+
+def get_patient_service(client: EndotoolsClientDep, cache: PatientCacheDep,
+                        report_cache: ReportCacheDep, memo: RequestMemoDep) -> PatientService:
+    return PatientService(client, cache, report_cache, max_concurrency=settings.ENDOTOOLS_MAX_CONCURRENCY,
+                          memo=memo)
 
 
 PatientServiceDep: TypeAlias = Annotated[PatientService, Depends(get_patient_service)]
+
+
+def create_patient_prefetcher(client: EndotoolsAPIClient, cache: PatientDataCache,
+                              report_cache: FileCache) -> PatientPrefetcher:
+    """ Background warm-up of the patient data cache after login. Created once, from the app lifespan """
+    service = PatientService(client, cache, report_cache, max_concurrency=settings.ENDOTOOLS_MAX_CONCURRENCY)
+    return PatientPrefetcher(service, max_pending=settings.PATIENT_PREFETCH_MAX_PENDING)
+
+
+def get_patient_prefetcher(request: Request) -> PatientPrefetcher:
+    """ Return the app-lifetime patient prefetcher from the app's shared state """
+    return request.app.state.patient_prefetcher
+
+
+PatientPrefetcherDep: TypeAlias = Annotated[PatientPrefetcher, Depends(get_patient_prefetcher)]
@@ -0,0 +1,43 @@
+import asyncio
+
+from src.core.config import logger
+from src.services.patient.service import PatientService
+
+
+class PatientPrefetcher:
+    """
+    Warms the patient data cache in the background (e.g. right after login), so the first page render is a cache
+    hit. One prefetch at a time per MRN; when `max_pending` prefetches are already running, new ones are skipped
+    (the page then simply loads the data itself).
+    """
+
+    def __init__(self, service: PatientService, max_pending: int = 100):
+        self.service = service
+        self.max_pending = max_pending
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.scheduled = 0
+        self.skipped = 0
+
+    def schedule(self, mrn: str | None, patient_id: int | None = None) -> None:
+        if not mrn or mrn in self._tasks:
+            return
+        if len(self._tasks) >= self.max_pending:
+            self.skipped += 1
+            logger.warning(f"Patient prefetch skipped for MRN {mrn}: {len(self._tasks)} already running")
+            return
+        task = asyncio.create_task(self.service.prefetch(mrn, patient_id))
+        self._tasks[mrn] = task
+        self.scheduled += 1
+        task.add_done_callback(lambda t: self._on_done(mrn, t))
+
+    async def close(self) -> None:
+        """ Cancel pending prefetches (on app shutdown) """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _on_done(self, mrn: str, task: asyncio.Task) -> None:
+        self._tasks.pop(mrn, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Patient prefetch failed for MRN {mrn}: {task.exception()}")
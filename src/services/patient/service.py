@@ -1,18 +1,103 @@
-from collections.abc import AsyncIterator
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from pathlib import Path
+from typing import Any
 
 from src.infrastructure.external.endotools.client import EndotoolsAPIClient
 from src.infrastructure.external.endotools.exceptions import (
     ExternalAPIError, ExternalAPITimeoutError, ExternalAPINotFoundError,
     ExternalAPIAuthenticationError, ExternalAPIPermissionError, ExternalAPIServerError
 )
+from src.infrastructure.external.endotools.schemas import DemographicsDTO, AppointmentDTO, ExaminationDTO, ReportDTO
+from src.lib.cache import FileCache, RequestMemo
 from src.mappers.endotools.patient_mapper import to_patient_summary
 from src.mappers.endotools.data_mapper import to_appointment, to_examination, to_report
 from src.core.config import logger
+from src.schemas.patient import Examination
+from src.services.patient.cache import PatientDataCache, PatientResource
 
 
 class PatientService:
-    def __init__(self, client: EndotoolsAPIClient):
+    def __init__(self, client: EndotoolsAPIClient, cache: PatientDataCache, report_cache: FileCache | None = None,
+                 max_concurrency: int = 8, memo: RequestMemo | None = None):
         self.client = client
+        self.cache = cache
+        self.report_cache = report_cache
+        self.max_concurrency = max_concurrency
+        # Request-scoped memo: only given to per-request instances (see deps.get_patient_service)
+        self.memo = memo
+
+    # Cached Endotools reads (request memo, then PatientDataCache)
+    async def _load(self, resource: PatientResource, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.memo is None:
+            return await self.cache.get_or_load(resource, key, loader)
+        return await self.memo.get_or_call((resource, key),
+                                           lambda: self.cache.get_or_load(resource, key, loader))
+
+    async def _get_demographics(self, mrn: str) -> DemographicsDTO:
+        return await self._load(PatientResource.DEMOGRAPHICS, mrn, lambda: self.client.get_demographics(mrn))
+
+    async def _get_appointments(self, mrn: str) -> list[AppointmentDTO]:
+        return await self._load(PatientResource.APPOINTMENTS, mrn, lambda: self.client.get_appointments(mrn))
+
+    async def _get_examinations(self, patient_id: int) -> list[ExaminationDTO]:
+        return await self._load(PatientResource.EXAMINATIONS, patient_id,
+                                lambda: self.client.get_examinations(patient_id))
+
+    async def _get_reports(self, exam_id: int) -> list[ReportDTO]:
+        return await self._load(PatientResource.REPORTS, exam_id, lambda: self.client.get_reports(exam_id))
+
+    def _start_report_lookups(self, examinations: list) -> list[asyncio.Task]:
+        """
+        Start fetching the reports of every examination concurrently, with at most `max_concurrency` upstream
+        calls in flight for this request. Returns one task per examination, in the same order; each one results
+        in None if its lookup failed (a failing examination does not affect the others).
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def fetch(exam):
+            async with semaphore:
+                try:
+                    return await self._get_reports(exam.exam_id)
+                except ExternalAPIError as e:
+                    logger.warning(f"Failed to get reports for exam {exam.exam_id}: {e}")
+                    return None
+
+        return [asyncio.create_task(fetch(exam)) for exam in examinations]
+
+    async def _get_reports_for_examinations(self, examinations: list) -> list[list | None]:
+        """ Reports of every examination, fetched concurrently (see _start_report_lookups); None if failed """
+        lookups = self._start_report_lookups(examinations)
+        try:
+            return await asyncio.gather(*lookups)
+        finally:
+            for lookup in lookups:
+                lookup.cancel()
+
+    async def prefetch(self, mrn: str, patient_id: int | None = None) -> None:
+        """
+        Load a patient's demographics, appointments, examinations and report availability into the cache,
+        without mapping them. Meant to run in background (see PatientPrefetcher); failures are only logged.
+        With a known Endotools `patient_id`, examinations do not wait for the demographics.
+        """
+        async def examinations_and_reports():
+            exam_patient_id = patient_id
+            if exam_patient_id is None:
+                exam_patient_id = (await self._get_demographics(mrn)).id
+            exams_dto = await self._get_examinations(exam_patient_id)
+            await self._get_reports_for_examinations([to_examination(exam) for exam in exams_dto])
+
+        results = await asyncio.gather(
+            self._get_demographics(mrn),
+            self._get_appointments(mrn),
+            examinations_and_reports(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, ExternalAPIError):
+                logger.info(f"Prefetch incomplete for MRN {mrn}: {result}")
+            elif isinstance(result, BaseException):
+                raise result
 
     async def get_full_patient_data(self, mrn: str):
         patient = None
@@ -22,7 +107,7 @@ class PatientService:
 
         # Get demographics first
         try:
-            demo_dto = await self.client.get_demographics(mrn)
+            demo_dto = await self._get_demographics(mrn)
             patient = to_patient_summary(demo_dto)
         except ExternalAPINotFoundError:
             logger.warning(f"Patient not found with MRN: {mrn}")
@@ -34,7 +119,7 @@ class PatientService:
         # Get appointments (only if we have patient data)
         if patient:
             try:
-                appointments_dto = await self.client.get_appointments(mrn)
+                appointments_dto = await self._get_appointments(mrn)
                 appointments = [to_appointment(apt) for apt in appointments_dto]
             except ExternalAPIError as e:
                 logger.error(f"Failed to get appointments for MRN {mrn}: {e}")
@@ -42,19 +127,15 @@ class PatientService:
         # Get examinations (only if we have patient data)
         if patient:
             try:
-                exams_dto = await self.client.get_examinations(patient.patient_id)
+                exams_dto = await self._get_examinations(patient.patient_id)
                 examinations = [to_examination(exam) for exam in exams_dto]
             except ExternalAPIError as e:
                 logger.error(f"Failed to get examinations for patient ID {patient.mrn}: {e}")
 
-        # Get reports for each examination
-        for exam in examinations:
-            try:
-                reports_dto = await self.client.get_reports(exam.exam_id)
+        # Get reports for each examination (concurrently, failed exams are skipped)
+        for reports_dto in await self._get_reports_for_examinations(examinations):
+            if reports_dto:
                 reports.extend([to_report(report) for report in reports_dto])
-            except ExternalAPIError as e:
-                logger.warning(f"Failed to get reports for exam {exam.exam_id}: {e}")
-                # Continue with other exams even if one fails
 
         return {
             "patient": patient,
@@ -67,7 +148,7 @@ class PatientService:
         patient = {}
 
         try:
-            data = await self.client.get_demographics(mrn)
+            data = await self._get_demographics(mrn)
             patient = to_patient_summary(data)
         except ExternalAPINotFoundError:
             logger.warning(f"Patient not found with MRN: {mrn}")
@@ -81,53 +162,95 @@ class PatientService:
     async def get_appointments_data(self, mrn: str):
         appointments = []
         try:
-            appointments_dto = await self.client.get_appointments(mrn)
+            appointments_dto = await self._get_appointments(mrn)
             appointments = [to_appointment(apt) for apt in appointments_dto]
         except ExternalAPIError as e:
             logger.error(f"Failed to get appointments for MRN {mrn}: {e}")
         return appointments
 
-    async def get_examinations_data(self, mrn: str):
-        patient = None
-        examinations = []
+    async def get_examinations_data(self, mrn: str, patient_id: int | None = None):
+        """ `patient_id`: Endotools patient id, when stored locally; saves resolving it from the demographics """
+        examinations = await self._get_examination_views(mrn, patient_id)
+        if examinations is None:
+            return None
 
-        # Get demographics first
+        # Get reports for each examination (concurrently, failed exams are skipped)
+        reports_per_exam = await self._get_reports_for_examinations(examinations)
+        for exam, reports_dto in zip(examinations, reports_per_exam):
+            if reports_dto:
+                # add flag indicating report available
+                exam.is_report_available = True
+
+        return examinations
+
+    async def iter_examinations_data(self, mrn: str, patient_id: int | None = None) -> AsyncIterator[Examination]:
+        """
+        Streaming variant of get_examinations_data: examinations are yielded in order, each one as soon as its
+        own report lookup (and the previous ones) finished, while the others are still being fetched.
+        """
+        examinations = await self._get_examination_views(mrn, patient_id)
+        if not examinations:
+            return
+
+        lookups = self._start_report_lookups(examinations)
         try:
-            demo_dto = await self.client.get_demographics(mrn)
-            patient = to_patient_summary(demo_dto)
-        except ExternalAPINotFoundError:
-            logger.warning(f"Patient not found with MRN: {mrn}")
-            return None
-        except ExternalAPIError as e:
-            logger.error(f"Failed to get demographics for MRN {mrn}: {e}")
-            # Continue with empty data if demographics fail
+            for exam, lookup in zip(examinations, lookups):
+                if await lookup:
+                    # add flag indicating report available
+                    exam.is_report_available = True
+                yield exam
+        finally:
+            # The client went away, or rendering failed: stop the remaining lookups
+            for lookup in lookups:
+                lookup.cancel()
 
-        # Get examinations (only if we have patient data)
-        if patient:
+    async def _get_examination_views(self, mrn: str, patient_id: int | None) -> list[Examination] | None:
+        """ Patient examinations, mapped; None if the patient does not exist, empty if they could not be fetched """
+        examinations = []
+
+        # Get demographics first, only to resolve the Endotools patient id
+        if patient_id is None:
             try:
-                exams_dto = await self.client.get_examinations(patient.patient_id)
-                examinations = [to_examination(exam) for exam in exams_dto]
+                demo_dto = await self._get_demographics(mrn)
+                patient_id = demo_dto.id
+            except ExternalAPINotFoundError:
+                logger.warning(f"Patient not found with MRN: {mrn}")
+                return None
             except ExternalAPIError as e:
-                logger.error(f"Failed to get examinations for patient ID {patient.mrn}: {e}")
+                logger.error(f"Failed to get demographics for MRN {mrn}: {e}")
+                # Continue with empty data if demographics fail
 
-            # Get reports for each examination
-            for exam in examinations:
-                try:
-                    reports_dto = await self.client.get_reports(exam.exam_id)
-                    if len(reports_dto) > 0:
-                        # add flag indicating report available
-                        exam.is_report_available = True
-                except ExternalAPIError as e:
-                    logger.warning(f"Failed to get reports for exam {exam.exam_id}: {e}")
-                    # Continue with other exams even if one fails
+        # Get examinations (only if we have patient id)
+        if patient_id is not None:
+            try:
+                exams_dto = await self._get_examinations(patient_id)
+                examinations = [to_examination(exam) for exam in exams_dto]
+            except ExternalAPIError as e:
+                logger.error(f"Failed to get examinations for patient ID {patient_id}: {e}")
 
         return examinations
 
+    async def checkout_cached_exam_report(self, exploration_id: int) -> Path | None:
+        """
+        Path of the examination last report in the local disk cache, if cached; it stays readable until
+        release_cached_exam_report is called, even if the cache entry expires or is evicted meanwhile
+        """
+        if self.report_cache is None:
+            return None
+        return await self.report_cache.checkout(str(exploration_id))
+
+    async def release_cached_exam_report(self, path: Path) -> None:
+        await self.report_cache.release(path)
+
     async def get_exam_last_report(self, exploration_id: int, ) -> AsyncIterator[bytes]:
         """
         get_last_report is an async generator
         StreamingResponse consumes it lazily
         The httpx connection stays open while chunks are yielded
         When streaming finishes or client disconnects → context managers exit cleanly
+        The stream is tee'd into the report disk cache: once fully sent, later downloads are served from disk.
         """
-        return self.client.get_last_report(exploration_id)
+        stream = self.client.get_last_report(exploration_id)
+        if self.report_cache is None:
+            return stream
+        return self.report_cache.tee(str(exploration_id), stream)
@@ -2,12 +2,12 @@ from typing import Annotated, TypeAlias
 
 from fastapi import Depends
 
-from src.services.common.deps import EndotoolsClientDep
+from src.services.common.deps import EndotoolsClientDep, ReferenceCacheDep
 from src.services.province.service import ProvinceService
 
 
-def get_province_service(client: EndotoolsClientDep) -> ProvinceService:
-    return ProvinceService(client)
+def get_province_service(client: EndotoolsClientDep, cache: ReferenceCacheDep) -> ProvinceService:
+    return ProvinceService(client, cache)
 
 
 ProvinceServiceDep: TypeAlias = Annotated[ProvinceService, Depends(get_province_service)]
@@ -1,17 +1,21 @@
 from src.core.config import logger
 from src.infrastructure.external.endotools.client import EndotoolsAPIClient
 from src.infrastructure.external.endotools.exceptions import ExternalAPIError, ExternalAPINotFoundError
+from src.lib.cache import StaleWhileRevalidateCache
 from src.mappers.endotools.data_mapper import to_province
 
 
 class ProvinceService:
-    def __init__(self, client: EndotoolsAPIClient):
+    CACHE_KEY = "provinces"
+
+    def __init__(self, client: EndotoolsAPIClient, cache: StaleWhileRevalidateCache):
         self.client = client
+        self.cache = cache
 
     async def get_provinces(self):
 
         try:
-            data = await self.client.get_provinces()
+            data = await self.cache.get(self.CACHE_KEY, self.client.get_provinces)
             provinces = [to_province(province_dto) for province_dto in data]
         except ExternalAPINotFoundError:
             logger.warning(f"Provinces not found")
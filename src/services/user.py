@@ -1,55 +1,77 @@
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import select, lambda_stmt
 
-from src.auth.pwd import hash_password
+from src.auth.cache import UserSnapshot, user_cache
+from src.auth.hasher import password_hasher
 from src.models import User
 from src.models.patient import Patient
 from src.core.config import logger
 
 
-def get_user_by_username(db: Session, username: str):
+async def get_user_by_username(db: AsyncSession, username: str):
     stmt = select(User).where(User.username == username)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def get_active_user_by_id(db: Session, user_id: int | None) -> type[User] | None:
+async def get_active_user_by_id(db: AsyncSession, user_id: int | None) -> User | None:
     if user_id is None:
         return None
     stmt = (
         select(User)
         .where(User.id == user_id, User.is_active == True)
     )
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def update_user_password(db: Session, user: User, password: str) -> User:
-    hashed_password = hash_password(password)
+async def get_active_user_snapshot(db: AsyncSession, user_id: int | None) -> UserSnapshot | None:
+    """
+    Auth hot path: load just what a UserSnapshot needs, user and patient columns in a single round-trip.
+    Built as a lambda statement, so SQLAlchemy caches its construction and compilation; only user_id is bound per call.
+    """
+    if user_id is None:
+        return None
+    stmt = lambda_stmt(
+        lambda: select(User.id, User.is_active, User.name, Patient.mrn, Patient.external_id)
+        .outerjoin(Patient, Patient.user_id == User.id)
+        .where(User.id == user_id, User.is_active == True)
+    )
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return None
+    return UserSnapshot(id=row.id, is_active=row.is_active, name=row.name, mrn=row.mrn,
+                        patient_external_id=row.external_id)
+
+
+async def update_user_password(db: AsyncSession, user: User, password: str) -> User:
+    hashed_password = await password_hasher.hash_password(password)
     user.hashed_password = hashed_password
     # Update password logic; reset flags to normal use, after user update his password.
     user.is_password_expired = False
     user.otp_password_used = False
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
 
     return user
 
 
-def reset_user_password(db: Session, user: User, password: str) -> User:
-    hashed_password = hash_password(password)
+async def reset_user_password(db: AsyncSession, user: User, password: str) -> User:
+    hashed_password = await password_hasher.hash_password(password)
     user.hashed_password = hashed_password
     # Update password logic; set an OTP and set it expired, to force user to change upon login.
     user.is_password_expired = True
     user.otp_password_used = False
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
 
     return user
 
 
-def create_user_with_patient(
-    db: Session,
+async def create_user_with_patient(
+    db: AsyncSession,
     username: str,
     name: str,
     email: str,
@@ -57,7 +79,8 @@ def create_user_with_patient(
     password: str,
     mrn: str,
     mrn_system: str,
-    date_of_birth: date | None
+    date_of_birth: date | None,
+    external_id: int | None = None
 ) -> tuple[User, Patient]:
     """
     Create a User and associated Patient in a single transaction.
@@ -72,6 +95,7 @@ def create_user_with_patient(
         mrn: Medical Record Number
         mrn_system: MRN system identifier (e.g., "endotools")
         date_of_birth: Patient's date of birth
+        external_id: Patient id in the MRN system (Endotools internal id)
         
     Returns:
         Tuple of (User, Patient) objects
@@ -79,6 +103,7 @@ def create_user_with_patient(
     Raises:
         Exception: If either User or Patient creation fails, rolls back the entire transaction
     """
+    hashed_password = await password_hasher.hash_password(password)
     try:
         # Create User
         user = User(
@@ -86,14 +111,14 @@ def create_user_with_patient(
             name=name,
             email=email,
             phone=phone,
-            hashed_password=hash_password(password),
+            hashed_password=hashed_password,
             is_password_expired=True,
             otp_password_used=False,
             is_active=True,
             is_superuser=False
         )
         db.add(user)
-        db.flush()  # Flush to get the user.id without committing
+        await db.flush()  # Flush to get the user.id without committing
         
         # Create Patient linked to User
         patient = Patient(
@@ -101,21 +126,22 @@ def create_user_with_patient(
             mrn_system=mrn_system,
             name=name,
             date_of_birth=date_of_birth,
+            external_id=external_id,
             user_id=user.id
         )
         db.add(patient)
         
         # Commit both records
-        db.commit()
-        db.refresh(user)
-        db.refresh(patient)
+        await db.commit()
+        await db.refresh(user)
+        await db.refresh(patient)
         
         logger.info(f"User and Patient created successfully: username={username}, user_id={user.id}, patient_id={patient.id}")
         return user, patient
         
     except Exception as e:
         # Rollback on any error
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create User and Patient for username={username}: {e}")
         raise
 
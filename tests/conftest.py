@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+import pytest
+
+# The settings are read from the environment when src.core.config is imported: point everything at a throwaway
+# SQLite database and directory before any test module imports the app code.
+_tmp_dir = tempfile.mkdtemp(prefix="salus-tests-")
+for name, value in {
+    "DATABASE_DIALECT": "sqlite",
+    "DATABASE_ASYNC_DRIVER": "aiosqlite",
+    "DATABASE_HOST": "",
+    "DATABASE_NAME": os.path.join(_tmp_dir, "salus.db"),
+    "DATABASE_USERNAME": "",
+    "DATABASE_PASSWORD": "",
+    "SECRET_KEY": "test-secret",
+    "ENDOTOOLS_BASE_URL": "http://endotools.invalid",
+    "ENDOTOOLS_KEY": "test",
+    "EMAIL_SERVER": "localhost",
+    "EMAIL_PORT": "25",
+    "EMAIL_USERNAME": "salus",
+    "EMAIL_PASSWORD": "salus",
+    "EMAIL_FROM": "salus@example.com",
+    "EMAIL_STARTTLS": "False",
+    "EMAIL_SSL_TLS": "False",
+    "EMAIL_TEMPLATE_FOLDER": "src/templates/emails",
+    "PATH_LOGS": os.path.join(_tmp_dir, "logs"),
+    "TEMPLATES_CACHE_DIR": os.path.join(_tmp_dir, "jinja"),
+    "STATIC_BUILD_DIR": os.path.join(_tmp_dir, "static"),
+    "REPORT_CACHE_DIR": os.path.join(_tmp_dir, "reports"),
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from src.auth.cache import user_cache
+from src.auth.deps import get_current_user
+from src.auth.session import SESSION_COOKIE_NAME, create_session_cookie
+from src.core.database import Base
+from src.models import Patient, User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user = User(username="ana", name="Ana", email="ana@example.com", hashed_password="x")
+        session.add(user)
+        await session.flush()
+        session.add(Patient(mrn="MRN1", mrn_system="endotools", external_id=42, name="Ana", user_id=user.id))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(db):
+    """ SQL statements executed on the `db` engine """
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    sync_engine = db.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def authenticated_request(user_id: int) -> Request:
+    cookie, _csrf = create_session_cookie(user_id)
+    headers = [(b"cookie", f"{SESSION_COOKIE_NAME}={cookie}".encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def test_snapshot_cache_miss_loads_user_and_patient_in_one_statement(db, statements):
+    user_id = (await db.get(User, 1)).id
+    user_cache.invalidate(user_id)
+    statements.clear()
+
+    snapshot = await get_current_user(authenticated_request(user_id), db)
+
+    assert len(statements) == 1
+    assert (snapshot.id, snapshot.name, snapshot.mrn, snapshot.patient_external_id) == (user_id, "Ana", "MRN1", 42)
+
+
+async def test_snapshot_cache_hit_runs_no_statement(db, statements):
+    user_id = (await db.get(User, 1)).id
+    user_cache.invalidate(user_id)
+    await get_current_user(authenticated_request(user_id), db)
+    statements.clear()
+
+    snapshot = await get_current_user(authenticated_request(user_id), db)
+
+    assert statements == []
+    assert snapshot.mrn == "MRN1"
@@ -0,0 +1,61 @@
+import httpx
+import pytest
+
+from src.infrastructure.external.endotools.client import EndotoolsAPIClient
+from src.infrastructure.external.endotools.exceptions import ExternalAPICircuitOpenError, ExternalAPIServerError
+from src.infrastructure.external.endotools.resilience import CircuitState, RetryPolicy
+
+pytestmark = pytest.mark.anyio
+
+REPORTS_PATH = "/rest/exploraciones/7/informes.json"
+
+
+async def open_client(handler, failure_threshold: int = 5) -> EndotoolsAPIClient:
+    client = EndotoolsAPIClient("http://endotools.test", "key", retry_policy=RetryPolicy(max_retries=2, backoff_base=0),
+                                breaker_failure_threshold=failure_threshold)
+    client._client = httpx.AsyncClient(base_url="http://endotools.test", transport=httpx.MockTransport(handler))
+    return client
+
+
+async def test_failing_calls_with_retries_count_one_failure_each():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(500)
+
+    client = await open_client(handler, failure_threshold=5)
+    try:
+        for _ in range(4):
+            with pytest.raises(ExternalAPIServerError):
+                await client._get(REPORTS_PATH)
+        breaker = client.circuit_breakers["exploraciones/informes"]
+        assert len(requests) == 12  # every call was retried twice
+        assert (breaker.state, breaker.failures) == (CircuitState.CLOSED, 4)
+
+        with pytest.raises(ExternalAPIServerError):
+            await client._get(REPORTS_PATH)
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(ExternalAPICircuitOpenError):
+            await client._get(REPORTS_PATH)
+    finally:
+        await client.__aexit__(None, None, None)
+
+
+async def test_success_after_a_retry_counts_as_a_success():
+    responses = iter([httpx.Response(500), httpx.ConnectError("refused"), httpx.Response(200, json=[])] * 3)
+
+    def handler(request):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = await open_client(handler, failure_threshold=2)
+    try:
+        for _ in range(3):
+            assert (await client._get(REPORTS_PATH)).status_code == 200
+        breaker = client.circuit_breakers["exploraciones/informes"]
+        assert (breaker.state, breaker.failures) == (CircuitState.CLOSED, 0)
+    finally:
+        await client.__aexit__(None, None, None)
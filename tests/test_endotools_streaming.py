@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from src.infrastructure.external.endotools.streaming import JSONArrayStreamDecoder
+
+
+def decode(data: bytes, chunk_size: int) -> list[bytes]:
+    decoder = JSONArrayStreamDecoder()
+    elements = []
+    for start in range(0, len(data), chunk_size):
+        elements += decoder.feed(data[start:start + chunk_size])
+    decoder.close()
+    return elements
+
+
+def chunk_sizes(data: bytes) -> range:
+    """ Every split of `data` in equal chunks: each byte is a chunk boundary in at least one of them """
+    return range(1, len(data) + 1)
+
+
+@pytest.mark.parametrize("data", [
+    b"[]",
+    b" \r\n[ ]\t",
+    b"[1]",
+    b'[1, "two", null, true, 3.5e2]',
+    b'[{"id": 1, "tags": ["a", "b"]}, {"id": 2, "nested": {"list": [[], [{}]]}}]',
+    b'["brackets ] } [ { and commas , inside strings"]',
+    b'["escaped \\" quote, ] still inside", "backslash at the end \\\\", "\\\\\\""]',
+    b'["unicode \\u00e9 \xc3\xa9"]',
+    b'[{"a": "}"}, ["]"]]\n',
+])
+def test_splits_elements_like_json_loads(data):
+    for chunk_size in chunk_sizes(data):
+        elements = decode(data, chunk_size)
+        assert [json.loads(element) for element in elements] == json.loads(data), chunk_size
+
+
+@pytest.mark.parametrize("data", [
+    b"",  # nothing
+    b"[1, 2",  # truncated
+    b'[1, "unterminated',  # truncated inside a string
+    b'["escape at the end \\',  # truncated inside an escape
+    b"[1] 2",  # trailing garbage
+    b"[1]]",
+    b"[1}",  # mismatched closers
+    b"[{]}",
+    b'[{"a": [1}]]',
+    b"[,]",  # empty elements
+    b"[1,,2]",
+    b"[1,]",
+    b"[ , 1]",
+])
+def test_rejects_what_json_loads_rejects(data):
+    with pytest.raises(ValueError):
+        json.loads(data)
+    for chunk_size in chunk_sizes(data) or [1]:
+        with pytest.raises(ValueError):
+            decode(data, chunk_size)
+
+
+def test_rejects_a_top_level_object():
+    with pytest.raises(ValueError):
+        decode(b'{"id": 1}', 1)
+
+
+def test_trailing_garbage_in_a_later_chunk():
+    decoder = JSONArrayStreamDecoder()
+    assert decoder.feed(b"[1, 2]") == [b"1", b"2"]
+    assert decoder.feed(b"  \n") == []
+    with pytest.raises(ValueError):
+        decoder.feed(b"3")
+
+
+def test_keeps_only_the_pending_element():
+    decoder = JSONArrayStreamDecoder()
+    for i in range(1000):
+        decoder.feed(b"[" if i == 0 else b",")
+        assert decoder.feed(b'{"id": %d}' % i) == []
+        assert len(decoder._buffer) < 32
+    assert decoder.feed(b"]") == [b'{"id": 999}']
+    decoder.close()